@@ -0,0 +1,461 @@
+"""Çevrimdışı, tekrarlanabilir performans ölçümü.
+
+Yerel bir HTTP sunucusu kayıtlı arama/oyun sayfalarını (bench/pages) ve
+sentetik parça dosyalarını sunar; loopback üzerinde bir libtorrent seeder
+aynı dosyaları sentetik bir torrent olarak paylaşır. SearchThread,
+MagnetThread, DownloadThread ve HttpDownloadThread arayüz olmadan gerçek
+kod yollarıyla çalıştırılır; sonuçlar JSON olarak yazılır.
+
+Kullanım:
+    python bench/benchmark.py --size-gb 2 --output sonuc.json
+    python bench/benchmark.py --compare eski.json yeni.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+PAGES_DIR = BENCH_DIR / "pages"
+
+# Motor yerel ve izole çalışsın: DHT/UPnP vb. kapalı, sadece loopback
+LOOPBACK_SETTINGS = {
+    'enable_dht': False,
+    'enable_lsd': False,
+    'enable_upnp': False,
+    'enable_natpmp': False,
+    'listen_interfaces': '127.0.0.1:0',
+    'allow_multiple_connections_per_ip': True,
+}
+BLOCK_SIZE = 1024 * 1024
+
+
+def percentiles(values):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    pick = lambda q: ordered[max(0, -(-q * len(ordered) // 100) - 1)]
+    return {"p50": pick(50), "p95": pick(95), "min": ordered[0], "max": ordered[-1], "samples": len(ordered)}
+
+
+def make_synthetic_files(seed_dir, size_bytes, file_count, seed=1337):
+    """Belirlenimli içerikli parça dosyaları oluştur (zaten varsa tekrar kullan)"""
+    seed_dir.mkdir(parents=True, exist_ok=True)
+    per_file = size_bytes // file_count
+    files = []
+    for index in range(file_count):
+        path = seed_dir / f"fg-{index + 1:02d}.bin"
+        files.append(path)
+        if path.exists() and path.stat().st_size == per_file:
+            continue
+        rng = random.Random(seed + index)
+        with open(path, "wb") as f:
+            remaining = per_file
+            while remaining:
+                block = rng.randbytes(min(BLOCK_SIZE, remaining))
+                f.write(block)
+                remaining -= len(block)
+    return files
+
+
+def make_torrent(lt, seed_root, name):
+    torrent_path = seed_root / f"{name}.torrent"
+    if torrent_path.exists() and torrent_path.stat().st_mtime >= (seed_root / name).stat().st_mtime:
+        return lt.torrent_info(str(torrent_path))
+    with warnings.catch_warnings():
+        # libtorrent 2.1'de eskiyen ama 2.0 ile uyumlu API
+        warnings.simplefilter("ignore", DeprecationWarning)
+        fs = lt.file_storage()
+        lt.add_files(fs, str(seed_root / name))
+        t = lt.create_torrent(fs)
+        lt.set_piece_hashes(t, str(seed_root))
+    torrent_path.write_bytes(lt.bencode(t.generate()))
+    return lt.torrent_info(str(torrent_path))
+
+
+def run_seeder(torrent_path, seed_root, port_queue):
+    """Ayrı süreçte seed_mode ile paylaşan loopback seeder"""
+    import libtorrent as lt
+    ses = lt.session(LOOPBACK_SETTINGS)
+    params = lt.add_torrent_params()
+    params.ti = lt.torrent_info(torrent_path)
+    params.save_path = seed_root
+    params.flags |= lt.torrent_flags.seed_mode
+    ses.add_torrent(params)
+    port_queue.put(ses.listen_port())
+    while True:
+        time.sleep(1)
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    """Arama ve oyun sayfalarını, parça dosyalarını (Range destekli) sunar"""
+    base = ""
+    magnet = ""
+    files_dir = None
+
+    def do_HEAD(self):
+        self.serve(head_only=True)
+
+    def do_GET(self):
+        self.serve(head_only=False)
+
+    def serve(self, head_only):
+        parsed = urlparse(self.path)
+        if parsed.path.startswith("/files/"):
+            self.serve_file(self.files_dir / os.path.basename(parsed.path), head_only)
+            return
+
+        if "s" in parse_qs(parsed.query):
+            page = (PAGES_DIR / "search.html").read_text(encoding="utf-8")
+            page = page.replace("{{QUERY}}", parse_qs(parsed.query)["s"][0])
+        else:
+            page = (PAGES_DIR / "post.html").read_text(encoding="utf-8")
+            page = page.replace("{{PARTS}}", self.part_links())
+        body = page.replace("{{BASE}}", self.base).replace("{{MAGNET}}", self.magnet).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def part_links(self):
+        """Sayfadaki parça listesi torrentteki dosyalarla birebir aynı olsun"""
+        names = sorted(path.name for path in self.files_dir.iterdir() if path.is_file())
+        return "\n\t\t\t".join(
+            f'<li><a href="{{{{BASE}}}}/files/{name}" target="_blank" rel="noopener">{name}</a></li>' for name in names
+        )
+
+    def serve_file(self, path, head_only):
+        if not path.is_file():
+            self.send_error(404)
+            return
+        size = path.stat().st_size
+        start, end = 0, size - 1
+        match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if match:
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else size - 1
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        if head_only:
+            return
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            try:
+                while remaining:
+                    chunk = f.read(min(BLOCK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+            except (ConnectionError, BrokenPipeError):
+                pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=REPO_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Bench:
+    def __init__(self, args, main, app):
+        self.args = args
+        self.main = main
+        self.app = app
+
+    def wait_for(self, thread, signals, timeout):
+        """Thread'i başlat ve sinyallerden biri gelene kadar olay döngüsünü çalıştır"""
+        from PyQt6.QtCore import QEventLoop, QTimer
+        loop = QEventLoop()
+        result = []
+        handlers = []
+        for name in signals:
+            handler = (lambda name: lambda *args: (result.append((name, args)), loop.quit()))(name)
+            getattr(thread, name).connect(handler)
+            handlers.append((name, handler))
+        QTimer.singleShot(int(timeout * 1000), loop.quit)
+        thread.start()
+        loop.exec()
+        if not result and hasattr(thread, "stop"):
+            thread.stop()
+        thread.wait()
+        for name, handler in handlers:
+            getattr(thread, name).disconnect(handler)
+        if not result:
+            raise TimeoutError(f"{type(thread).__name__}: {timeout}s içinde yanıt yok")
+        return result[0]
+
+    def bench_search(self):
+        latency, request, parse = [], [], []
+        for _ in range(self.args.iterations):
+            thread = self.main.SearchThread("red dead redemption")
+            started = time.monotonic()
+            name, args = self.wait_for(thread, ["results_ready", "error"], 30)
+            if name == "error" or not args[0]:
+                raise RuntimeError(f"Arama başarısız: {args}")
+            latency.append(time.monotonic() - started)
+            durations = thread.trace.durations()
+            request.append(durations["search_request"])
+            parse.append(durations["search_parse"])
+        return {"search_latency": percentiles(latency), "search_request": percentiles(request),
+                "search_parse": percentiles(parse)}
+
+    def bench_magnet(self, post_url):
+        latency, request, parse = [], [], []
+        links = None
+        for _ in range(self.args.iterations):
+            thread = self.main.MagnetThread(post_url)
+            started = time.monotonic()
+            name, args = self.wait_for(thread, ["links_found", "error"], 30)
+            if name == "error":
+                raise RuntimeError(f"Link bulunamadı: {args}")
+            latency.append(time.monotonic() - started)
+            durations = thread.trace.durations()
+            request.append(durations["magnet_request"])
+            parse.append(durations["magnet_parse"])
+            links = args
+        return {"magnet_latency": percentiles(latency), "magnet_request": percentiles(request),
+                "magnet_parse": percentiles(parse)}, links
+
+    def sample_transfer(self, thread, done_bytes, total_bytes, timeout):
+        """İndirme sürerken ilerlemeyi örnekle; %10-%90 arası kararlı hız"""
+        from PyQt6.QtCore import QTimer
+        samples = []
+        timer = QTimer()
+        timer.timeout.connect(lambda: samples.append((time.monotonic(), done_bytes())))
+        timer.start(250)
+        gui_cpu = time.process_time()
+        started = time.monotonic()
+        name, args = self.wait_for(thread, ["finished"], timeout)
+        elapsed = time.monotonic() - started
+        timer.stop()
+        gui_cpu = time.process_time() - gui_cpu
+        if not args[1]:
+            raise RuntimeError(f"{type(thread).__name__} başarısız oldu")
+        samples.append((time.monotonic(), total_bytes))
+
+        low = next((s for s in samples if s[1] >= total_bytes * 0.1), samples[0])
+        high = next((s for s in samples if s[1] >= total_bytes * 0.9), samples[-1])
+        steady = (high[1] - low[1]) / (high[0] - low[0]) if high[0] > low[0] else total_bytes / elapsed
+        return {
+            "elapsed_seconds": elapsed,
+            "average_mb_per_s": total_bytes / elapsed / 1e6,
+            "steady_mb_per_s": steady / 1e6,
+        }, gui_cpu
+
+    def bench_torrent(self, magnet, total_bytes, download_dir):
+        main = self.main
+        engine = main.EngineClient.connect(spawn=True)
+        if engine is None:
+            raise RuntimeError("İndirme motoru başlatılamadı")
+        try:
+            engine_before = engine.request("metrics")
+            trace = main.Trace(time.monotonic())
+            thread = main.DownloadThread(magnet, str(download_dir), 0, engine, trace=trace)
+
+            def done_bytes():
+                record = engine.status(0)
+                return record.total_done if record else 0
+
+            transfer, gui_cpu = self.sample_transfer(thread, done_bytes, total_bytes, self.args.timeout)
+            engine_after = engine.request("metrics")
+            megabytes = total_bytes / 1e6
+            transfer.update(
+                time_to_metadata=trace.durations().get("metadata"),
+                time_to_first_payload=trace.durations().get("first_payload"),
+                cpu_seconds_per_mb={
+                    "engine": (engine_after["cpu_seconds"] - engine_before["cpu_seconds"]) / megabytes,
+                    "gui": gui_cpu / megabytes,
+                },
+                peak_rss_mb={
+                    "engine": (engine_after["peak_rss_bytes"] or 0) / 1e6,
+                    "gui": (main.process_stats()["peak_rss_bytes"] or 0) / 1e6,
+                },
+            )
+            engine.request("stop", download_id=0)
+            return transfer
+        finally:
+            try:
+                engine.request("shutdown")
+            except Exception:
+                pass
+            engine.close()
+
+    def bench_http(self, urls, total_bytes, download_dir):
+        thread = self.main.HttpDownloadThread(urls, str(download_dir), 1)
+        transfer, gui_cpu = self.sample_transfer(thread, lambda: thread.bytes_done, total_bytes, self.args.timeout)
+        transfer.update(
+            time_to_first_payload=thread.trace.durations().get("first_payload"),
+            cpu_seconds_per_mb={"gui": gui_cpu / (total_bytes / 1e6)},
+            peak_rss_mb={"gui": (self.main.process_stats()["peak_rss_bytes"] or 0) / 1e6},
+        )
+        return transfer
+
+
+def run(args):
+    workdir = Path(args.workdir)
+    home = workdir / "home"
+    shutil.rmtree(home, ignore_errors=True)
+    home.mkdir(parents=True)
+    (home / "config.json").write_text(json.dumps({"session_settings": LOOPBACK_SETTINGS}))
+
+    # main modülü yüklenmeden önce izole örnek ayarla (motor süreci de devralır)
+    os.environ["FGR_DLP_HOME"] = str(home)
+    os.environ["FGR_DLP_INSTANCE"] = f"fgr-dlp-bench-{os.getpid()}"
+    sys.path.insert(0, str(REPO_DIR))
+    import main
+    import libtorrent as lt
+    from PyQt6.QtCore import QCoreApplication
+
+    size_bytes = int(args.size_gb * 1024 ** 3)
+    seed_root = workdir / "seed"
+    name = f"synthetic-{size_bytes}-{args.files}"
+    print(f"Sentetik veri hazırlanıyor: {args.size_gb} GB, {args.files} dosya...")
+    files = make_synthetic_files(seed_root / name, size_bytes, args.files)
+    total_bytes = sum(f.stat().st_size for f in files)
+    info = make_torrent(lt, seed_root, name)
+
+    port_queue = multiprocessing.Queue()
+    seeder = multiprocessing.Process(
+        target=run_seeder, args=(str(seed_root / f"{name}.torrent"), str(seed_root), port_queue), daemon=True
+    )
+    seeder.start()
+    seeder_port = port_queue.get(timeout=60)
+
+    SiteHandler.files_dir = seed_root / name
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SiteHandler)
+    server.daemon_threads = True
+    SiteHandler.base = f"http://127.0.0.1:{server.server_port}"
+    SiteHandler.magnet = lt.make_magnet_uri(info) + f"&x.pe=127.0.0.1:{seeder_port}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    main.SITE_URL = SiteHandler.base
+
+    app = QCoreApplication(sys.argv[:1])
+    bench = Bench(args, main, app)
+    results = {}
+    try:
+        print("Arama ölçülüyor...")
+        results.update(bench.bench_search())
+        print("Sayfa/magnet ayrıştırma ölçülüyor...")
+        magnet_results, (magnet, mirrors) = bench.bench_magnet(f"{SiteHandler.base}/red-dead-redemption-2/")
+        results.update(magnet_results)
+        direct_links = next(iter(mirrors.values()), [])
+        if len(direct_links) != len(files):
+            raise RuntimeError(f"Sayfada {len(direct_links)} parça linki var, {len(files)} dosya bekleniyordu")
+
+        download_dir = workdir / "download"
+        shutil.rmtree(download_dir, ignore_errors=True)
+        print("Torrent indirmesi ölçülüyor...")
+        results["torrent"] = bench.bench_torrent(magnet, total_bytes, download_dir / "torrent")
+        if not args.skip_http:
+            print("Doğrudan indirme ölçülüyor...")
+            results["http"] = bench.bench_http(direct_links, total_bytes, download_dir / "http")
+        if not args.keep:
+            shutil.rmtree(download_dir, ignore_errors=True)
+    finally:
+        server.shutdown()
+        seeder.terminate()
+
+    return {
+        "revision": git_revision(),
+        "timestamp": time.time(),
+        "platform": {
+            "system": platform.system(),
+            "release": platform.release(),
+            "machine": platform.machine(),
+            "python": platform.python_version(),
+            "libtorrent": lt.__version__,
+            "cpu_count": os.cpu_count(),
+        },
+        "params": {"size_gb": args.size_gb, "files": args.files, "iterations": args.iterations},
+        "results": results,
+    }
+
+
+def flatten(data, prefix=""):
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(base_path, new_path):
+    base = json.loads(Path(base_path).read_text(encoding="utf-8"))
+    new = json.loads(Path(new_path).read_text(encoding="utf-8"))
+    print(f"{'metrik':<48} {base.get('revision') or 'eski':>12} {new.get('revision') or 'yeni':>12} {'fark':>9}")
+    base_flat = flatten(base["results"])
+    new_flat = flatten(new["results"])
+    for name in sorted(set(base_flat) | set(new_flat)):
+        if name.endswith(".samples"):
+            continue
+        old, cur = base_flat.get(name), new_flat.get(name)
+        if old is None or cur is None:
+            delta = "-"
+        elif old:
+            delta = f"{(cur - old) / old * 100:+.1f}%"
+        else:
+            delta = "0"
+        fmt = lambda v: "-" if v is None else f"{v:.4f}"
+        print(f"{name:<48} {fmt(old):>12} {fmt(cur):>12} {delta:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="fgr-dlp çevrimdışı benchmark")
+    parser.add_argument("--size-gb", type=float, default=1.0, help="sentetik torrent boyutu (GB)")
+    parser.add_argument("--files", type=int, default=4, help="sentetik torrentteki dosya sayısı")
+    parser.add_argument("--iterations", type=int, default=20, help="arama/ayrıştırma tekrar sayısı")
+    parser.add_argument("--timeout", type=float, default=1800, help="indirme başına zaman aşımı (s)")
+    parser.add_argument("--workdir", default=str(Path(tempfile.gettempdir()) / "fgr-dlp-bench"))
+    parser.add_argument("--output", help="sonuç JSON dosyası (varsayılan: stdout)")
+    parser.add_argument("--skip-http", action="store_true", help="doğrudan indirme ölçümünü atla")
+    parser.add_argument("--keep", action="store_true", help="indirilen dosyaları silme")
+    parser.add_argument("--compare", nargs=2, metavar=("ESKI", "YENI"), help="iki sonuç dosyasını karşılaştır")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        Path(args.output).write_text(report + "\n", encoding="utf-8")
+        print(f"Sonuçlar yazıldı: {args.output}")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
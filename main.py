@@ -2,18 +2,31 @@ import sys
 import os
 import re
 import time
+import shutil
+import tempfile
+import json
+import math
+import struct
+import subprocess
+import threading
+from array import array
+from collections import namedtuple, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.connection import Listener, Client, AuthenticationError
+from multiprocessing import shared_memory
 from pathlib import Path
-from urllib.parse import quote_plus, urljoin, urlparse, parse_qs
+from urllib.parse import quote_plus, urljoin, urlparse, parse_qs, unquote
 import requests
 from bs4 import BeautifulSoup
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLineEdit, QListWidget, QLabel, QFileDialog,
     QTabWidget, QListWidgetItem, QProgressBar, QGroupBox, QMessageBox,
-    QFrame, QSizePolicy
+    QFrame, QSizePolicy, QTableWidget, QTableWidgetItem, QHeaderView, QInputDialog
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QSize
-from PyQt6.QtGui import QFont, QPalette, QColor
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QSize, QPointF
+from PyQt6.QtGui import QFont, QPalette, QColor, QPainter, QPen, QPolygonF, QImage
 
 # libtorrent'ı import et
 try:
@@ -29,231 +42,1824 @@ except ImportError as e:
     print("  https://aka.ms/vs/17/release/vc_redist.x64.exe")
 
 
+# Sitenin adresi
+SITE_URL = "https://fitgirl-repacks.site"
+
+# Uygulama verileri (motor anahtarı, soket, ayarlar vb.)
+# FGR_DLP_HOME ve FGR_DLP_INSTANCE ile ayrı bir örnek çalıştırılabilir (örn. benchmark)
+APP_DIR = Path(os.environ.get("FGR_DLP_HOME") or Path.home() / ".fgr-dlp")
+INSTANCE_NAME = os.environ.get("FGR_DLP_INSTANCE") or "fgr-dlp"
+CONFIG_FILE = APP_DIR / "config.json"
+
+# config.json ile değiştirilebilen varsayılan ayarlar
+DEFAULT_CONFIG = {
+    # Prometheus metin uç noktası; motor bu portu, arayüz port+1'i kullanır (None = kapalı)
+    "metrics_port": None,
+    "metrics_bind": "127.0.0.1",
+    # APP_DIR/metrics altına dönen JSONL dosyaları
+    "metrics_jsonl": False,
+    "metrics_interval": 10,  # saniye
+    "metrics_jsonl_max_bytes": 10 * 1024 * 1024,
+    "metrics_jsonl_backups": 5,
+    # create_session'daki varsayılanların üzerine yazılan libtorrent ayarları
+    "session_settings": {},
+    # Tamamlanan torrentlerin seed politikası (None = sınırsız)
+    "seed_ratio": 1.0,  # yükleme / indirme oranı
+    "seed_time": 2 * 60 * 60,  # saniye
+    "max_seeding": 3,  # aynı anda seed edilen torrent sayısı
+    # İndirme sürerken seed torrentlerine bırakılan upload slotu ve hızı (bayt/s)
+    "seed_upload_slots_while_downloading": 2,
+    "seed_upload_limit_while_downloading": 100 * 1024,
+    # Disk ön kontrolü: her birimde boş bırakılacak alan ve tam ön ayırma
+    "min_free_space": 512 * 1024 * 1024,
+    "preallocate": False,  # HDD'lerde parçalanmayı önler, dosyalar baştan tam boyutta açılır
+    # Bağlantı ayarlayıcısı: "auto" ölçümlere göre ayarlar, "manual" libtorrent/session_settings değerlerini korur
+    "tuning": "auto",
+    "tuning_min_connections": 50,
+    "tuning_max_connections": None,  # None = açık dosya sınırının yarısı
+    "tuning_max_cpu": 0.7,  # motorun kullanabileceği CPU (1.0 = tek çekirdek)
+    "tuning_max_disk_queue": 16 * 1024 * 1024,  # diske yazılmayı bekleyen bayt
+    # Torrentler önce bu hızlı yerel klasörlere indirilir, tamamlanınca seçilen klasöre taşınır
+    "scratch_dirs": [],  # boş = doğrudan seçilen klasöre indir
+    "scratch_placement": "free_space",  # "free_space" veya "round_robin"
+    # Taşıma hızı sınırı (bayt/s, 0 = sınırsız); indirme sürerken daha düşük sınır uygulanır
+    "move_rate_limit": 0,
+    "move_rate_limit_while_downloading": 20 * 1024 * 1024,
+}
+
+
+def load_config():
+    """Varsayılan ayarları config.json ile birleştir"""
+    config = dict(DEFAULT_CONFIG)
+    try:
+        config.update(json.loads(CONFIG_FILE.read_text(encoding="utf-8")))
+    except (OSError, ValueError):
+        pass
+    return config
+
+
+# İndirme motoru süreci ayarları
+ENGINE_SHM_NAME = INSTANCE_NAME.replace("-", "_") + "_status"
+ENGINE_KEY_FILE = APP_DIR / "engine.key"
+ENGINE_TICK = 0.5  # saniye
+if sys.platform == "win32":
+    ENGINE_ADDRESS = rf"\\.\pipe\{INSTANCE_NAME}-engine"
+    ENGINE_FAMILY = "AF_PIPE"
+else:
+    ENGINE_ADDRESS = str(APP_DIR / "engine.sock")
+    ENGINE_FAMILY = "AF_UNIX"
+
+TORRENT_STATES = [
+    "queued for checking",
+    "checking files",
+    "downloading metadata",
+    "downloading",
+    "finished",
+    "seeding",
+    "allocating",
+    "checking fastresume"
+]
+
+# Satırlardaki parça şeridinin kova sayısı
+PIECE_MAP_BUCKETS = 256
+
+# Durum kaydı bayrakları
+STATUS_PAUSED = 1
+STATUS_HAS_METADATA = 2
+STATUS_FINISHED = 4
+STATUS_FAILED = 8
+STATUS_RETIRED = 16  # seed sınırına ulaştı, session'dan çıkarıldı
+STATUS_QUEUED = 32  # diskte yer bekliyor
+STATUS_MOVING = 64  # geçici diskten son konuma taşınıyor
+
+StatusRecord = namedtuple("StatusRecord", [
+    "seq", "download_id", "state", "flags", "progress",
+    "download_rate", "upload_rate", "num_peers", "num_seeds",
+    "total_done", "total_wanted",
+])
+
+
+def format_size(num_bytes):
+    """Bayt sayısını okunur hale getir"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} TB"
+
+
+def create_session(overrides=None):
+    """Ayarları uygulanmış bir libtorrent session oluştur"""
+    ses = lt.session()
+    
+    # Ayarları tek tek dene (bazıları mevcut olmayabilir)
+    settings_to_try = {
+        'enable_dht': True,
+        'enable_lsd': True,
+        'enable_upnp': True,
+        'enable_natpmp': True,
+        'listen_interfaces': '0.0.0.0:6881',
+    }
+    
+    # PEX ayarını dene (bazı sürümlerde farklı isimle olabilir)
+    pex_variants = ['enable_pex', 'enable_peer_exchange', 'pex']
+    for pex_name in pex_variants:
+        try:
+            test_settings = {pex_name: True}
+            ses.apply_settings(test_settings)
+            settings_to_try[pex_name] = True
+            break
+        except:
+            continue
+    
+    # config.json'daki session_settings
+    settings_to_try.update(overrides or {})
+    
+    # Geçerli ayarları uygula
+    valid_settings = {}
+    for key, value in settings_to_try.items():
+        try:
+            test_dict = {key: value}
+            ses.apply_settings(test_dict)
+            valid_settings[key] = value
+        except (KeyError, AttributeError, TypeError):
+            continue
+    
+    # Tüm geçerli ayarları bir kerede uygula
+    if valid_settings:
+        try:
+            ses.apply_settings(valid_settings)
+        except Exception:
+            pass
+    
+    return ses
+
+
+def bucket_piece_map(pieces, availability, buckets=PIECE_MAP_BUCKETS):
+    """Parça bitfield'ını ve erişilebilirliği sabit sayıda kovaya indir.
+    
+    done[i] kovadaki indirilmiş parça oranı, available[i] kovadaki eksik
+    parçalardan en az bir peer'da bulunanların oranıdır (ikisi de 0-255).
+    """
+    done = bytearray(buckets)
+    available = bytearray(buckets)
+    count = len(pieces)
+    if not count:
+        return bytes(done), bytes(available)
+    
+    for bucket in range(buckets):
+        lo = bucket * count // buckets
+        hi = max(lo + 1, (bucket + 1) * count // buckets)
+        width = hi - lo
+        have = sum(pieces[lo:hi])
+        done[bucket] = have * 255 // width
+        missing = width - have
+        if missing and availability:
+            reachable = sum(1 for p, a in zip(pieces[lo:hi], availability[lo:hi]) if not p and a)
+            available[bucket] = reachable * 255 // missing
+        elif not missing:
+            available[bucket] = 255
+    return bytes(done), bytes(available)
+
+
+class StatusRing:
+    """Paylaşılan bellekte torrent durum kayıtları için halka tampon.
+    
+    Motor süreci kayıt ekler, arayüz süreci kayıtları doğrudan paylaşılan
+    bellekten okur. Her kayıt 1'den başlayan sıra numarasını taşır; okuyucu
+    beklediği numarayı görmezse kayıt üzerine yazılmıştır ve atlanır.
+    """
+    HEADER = struct.Struct("<4sIII")  # magic, version, capacity, record size
+    HEAD = struct.Struct("<Q")  # yazılan toplam kayıt sayısı
+    SEQ = struct.Struct("<Q")
+    RECORD = struct.Struct("<QiiIfffIIqq")
+    MAGIC = b"FGRS"
+    VERSION = 1
+    
+    def __init__(self, shm):
+        self.shm = shm
+        self.buf = shm.buf
+        magic, version, self.capacity, record_size = self.HEADER.unpack_from(self.buf, 0)
+        if magic != self.MAGIC or version != self.VERSION or record_size != self.RECORD.size:
+            raise RuntimeError("Durum belleği sürümü uyumsuz")
+        self.head_offset = self.HEADER.size
+        self.data_offset = self.head_offset + self.HEAD.size
+    
+    @classmethod
+    def create(cls, name=ENGINE_SHM_NAME, capacity=4096):
+        size = cls.HEADER.size + cls.HEAD.size + capacity * cls.RECORD.size
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Çökmüş bir motordan kalan bellek
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        cls.HEADER.pack_into(shm.buf, 0, cls.MAGIC, cls.VERSION, capacity, cls.RECORD.size)
+        cls.HEAD.pack_into(shm.buf, cls.HEADER.size, 0)
+        return cls(shm)
+    
+    @classmethod
+    def attach(cls, name=ENGINE_SHM_NAME):
+        shm = shared_memory.SharedMemory(name=name)
+        if sys.platform != "win32":
+            # Sahibi motor; arayüz kapanırken belleği silmesin
+            try:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, "shared_memory")
+            except Exception:
+                pass
+        return cls(shm)
+    
+    @property
+    def head(self):
+        return self.HEAD.unpack_from(self.buf, self.head_offset)[0]
+    
+    def _offset(self, seq):
+        return self.data_offset + ((seq - 1) % self.capacity) * self.RECORD.size
+    
+    def append(self, *fields):
+        seq = self.head + 1
+        offset = self._offset(seq)
+        # Önce gövde (sıra numarası 0 ile), en son sıra numarası yazılır
+        self.RECORD.pack_into(self.buf, offset, 0, *fields)
+        self.SEQ.pack_into(self.buf, offset, seq)
+        self.HEAD.pack_into(self.buf, self.head_offset, seq)
+    
+    def read_since(self, cursor):
+        """cursor'dan sonraki kayıtları döndür: (kayıtlar, yeni cursor)"""
+        head = self.head
+        start = max(cursor, head - self.capacity)
+        records = []
+        for seq in range(start + 1, head + 1):
+            offset = self._offset(seq)
+            record = self.RECORD.unpack_from(self.buf, offset)
+            if record[0] != seq or self.SEQ.unpack_from(self.buf, offset)[0] != seq:
+                continue
+            records.append(StatusRecord._make(record))
+        return records, head
+    
+    def close(self, unlink=False):
+        self.buf = None
+        self.shm.close()
+        if unlink:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def process_stats():
+    """Sürecin toplam CPU süresi ve en yüksek bellek kullanımı (bayt)"""
+    stats = {"cpu_seconds": time.process_time(), "peak_rss_bytes": None}
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux KB, macOS bayt döndürür
+        stats["peak_rss_bytes"] = peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        # Windows: GetProcessMemoryInfo
+        try:
+            import ctypes
+            from ctypes import wintypes
+            
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+            
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            get_current_process = ctypes.windll.kernel32.GetCurrentProcess
+            get_current_process.restype = wintypes.HANDLE
+            get_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+            get_memory_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS), wintypes.DWORD]
+            if get_memory_info(get_current_process(), ctypes.byref(counters), counters.cb):
+                stats["peak_rss_bytes"] = counters.PeakWorkingSetSize
+        except Exception:
+            pass
+    return stats
+
+
+class MetricsRegistry:
+    """Süreçteki indirmelerin zaman serisi metrikleri.
+    
+    Her indirme için son değerler ve durumlarda geçen süreler tutulur;
+    süreç düzeyinde toplamlar ve libtorrent session sayaçları eklenir.
+    """
+    DOWNLOAD_METRICS = {
+        "download_rate_bytes": ("gauge", "Download rate in bytes per second"),
+        "upload_rate_bytes": ("gauge", "Upload rate in bytes per second"),
+        "total_bytes": ("gauge", "Total wanted bytes"),
+        "done_bytes": ("gauge", "Downloaded wanted bytes"),
+        "peers": ("gauge", "Connected peers"),
+        "seeds": ("gauge", "Connected seeds"),
+        "pieces_total": ("gauge", "Number of pieces"),
+        "pieces_done": ("gauge", "Downloaded pieces"),
+        "wasted_bytes": ("counter", "Bytes that failed the hash check"),
+        "redundant_bytes": ("counter", "Bytes downloaded more than once"),
+    }
+    # Süreç toplamı anlamlı olan metrikler
+    PROCESS_TOTALS = ("download_rate_bytes", "upload_rate_bytes", "total_bytes", "done_bytes",
+                      "peers", "seeds", "wasted_bytes", "redundant_bytes")
+    
+    def __init__(self, process):
+        self.process = process
+        self.pid = os.getpid()
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+        self.downloads = {}  # {download_id: {"kind", "state", "updated", "values", "state_seconds"}}
+        self.removed_counters = {}  # kaldırılan indirmelerin sayaç değerleri; süreç toplamı azalmasın
+        self.session = {}  # libtorrent session sayaçları
+    
+    def update_download(self, download_id, kind, state, **values):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.downloads.get(download_id)
+            if entry is None:
+                entry = self.downloads[download_id] = {
+                    "kind": kind, "state": state, "updated": now, "values": {}, "state_seconds": {},
+                }
+            seconds = entry["state_seconds"]
+            seconds[entry["state"]] = seconds.get(entry["state"], 0.0) + (now - entry["updated"])
+            entry["state"] = state
+            entry["updated"] = now
+            entry["values"].update(values)
+    
+    def remove_download(self, download_id):
+        with self.lock:
+            entry = self.downloads.pop(download_id, None)
+            if entry is None:
+                return
+            for name, value in entry["values"].items():
+                if self.DOWNLOAD_METRICS.get(name, ("gauge",))[0] == "counter":
+                    self.removed_counters[name] = self.removed_counters.get(name, 0) + value
+    
+    def update_session(self, counters):
+        with self.lock:
+            self.session = dict(counters)
+    
+    @staticmethod
+    def state_seconds(entry, now):
+        """Durumlarda geçen süreler, şu anki durumda geçen süre dahil"""
+        seconds = dict(entry["state_seconds"])
+        seconds[entry["state"]] = seconds.get(entry["state"], 0.0) + (now - entry["updated"])
+        return seconds
+    
+    def snapshot(self):
+        """JSONL için tek satırlık anlık görüntü"""
+        now = time.monotonic()
+        with self.lock:
+            downloads = [
+                dict(entry["values"], download_id=download_id, kind=entry["kind"], state=entry["state"],
+                     state_seconds=self.state_seconds(entry, now))
+                for download_id, entry in self.downloads.items()
+            ]
+            session = dict(self.session)
+        return dict(
+            process_stats(),
+            ts=time.time(),
+            process=self.process,
+            pid=self.pid,
+            uptime=time.monotonic() - self.started,
+            downloads=downloads,
+            session=session,
+        )
+    
+    def render_prometheus(self):
+        """Prometheus metin formatı"""
+        snapshot = self.snapshot()
+        with self.lock:
+            removed_counters = dict(self.removed_counters)
+        process = f'process="{self.process}"'
+        lines = [
+            "# HELP fgr_process_uptime_seconds Process uptime",
+            "# TYPE fgr_process_uptime_seconds gauge",
+            f"fgr_process_uptime_seconds{{{process}}} {snapshot['uptime']:.3f}",
+            "# HELP fgr_process_downloads Downloads tracked by the process",
+            "# TYPE fgr_process_downloads gauge",
+            f"fgr_process_downloads{{{process}}} {len(snapshot['downloads'])}",
+            "# HELP fgr_process_cpu_seconds Total CPU time of the process",
+            "# TYPE fgr_process_cpu_seconds counter",
+            f"fgr_process_cpu_seconds{{{process}}} {snapshot['cpu_seconds']:.3f}",
+        ]
+        if snapshot["peak_rss_bytes"] is not None:
+            lines.append("# HELP fgr_process_peak_rss_bytes Peak resident memory of the process")
+            lines.append("# TYPE fgr_process_peak_rss_bytes gauge")
+            lines.append(f"fgr_process_peak_rss_bytes{{{process}}} {snapshot['peak_rss_bytes']}")
+        
+        for name, (metric_type, help_text) in self.DOWNLOAD_METRICS.items():
+            lines.append(f"# HELP fgr_download_{name} {help_text}")
+            lines.append(f"# TYPE fgr_download_{name} {metric_type}")
+            for download in snapshot["downloads"]:
+                if name in download:
+                    labels = f'{process},download_id="{download["download_id"]}",kind="{download["kind"]}"'
+                    lines.append(f"fgr_download_{name}{{{labels}}} {download[name]}")
+            if name in self.PROCESS_TOTALS:
+                total = sum(download.get(name, 0) for download in snapshot["downloads"])
+                if metric_type == "counter":
+                    total += removed_counters.get(name, 0)
+                lines.append(f"# TYPE fgr_process_{name} {metric_type}")
+                lines.append(f"fgr_process_{name}{{{process}}} {total}")
+        
+        lines.append("# HELP fgr_download_state_seconds Time spent in each state")
+        lines.append("# TYPE fgr_download_state_seconds counter")
+        for download in snapshot["downloads"]:
+            for state, seconds in download["state_seconds"].items():
+                labels = f'{process},download_id="{download["download_id"]}",kind="{download["kind"]}",state="{state}"'
+                lines.append(f"fgr_download_state_seconds{{{labels}}} {seconds:.3f}")
+        
+        if snapshot["session"]:
+            lines.append("# HELP fgr_session_counter libtorrent session statistics")
+            lines.append("# TYPE fgr_session_counter untyped")
+            for name, value in sorted(snapshot["session"].items()):
+                lines.append(f'fgr_session_counter{{{process},name="{name}"}} {value}')
+        
+        return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """MetricsRegistry'yi Prometheus uç noktası ve dönen JSONL dosyalarıyla dışa aktar"""
+    def __init__(self, registry, config, port_offset=0):
+        self.registry = registry
+        self.config = config
+        self.port_offset = port_offset
+        self.server = None
+        self.jsonl_path = APP_DIR / "metrics" / f"{registry.process}.jsonl"
+        self.next_write = 0.0
+    
+    def start(self):
+        port = self.config["metrics_port"]
+        if port is None:
+            return
+        registry = self.registry
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        try:
+            self.server = ThreadingHTTPServer((self.config["metrics_bind"], port + self.port_offset), Handler)
+        except OSError as e:
+            print(f"Metrik sunucusu başlatılamadı: {e}")
+            return
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+    
+    def tick(self):
+        """Zamanı geldiyse JSONL dosyasına bir satır yaz"""
+        if not self.config["metrics_jsonl"] or time.monotonic() < self.next_write:
+            return
+        self.next_write = time.monotonic() + self.config["metrics_interval"]
+        try:
+            self.jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+            if self.jsonl_path.exists() and self.jsonl_path.stat().st_size >= self.config["metrics_jsonl_max_bytes"]:
+                self.rotate()
+            with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.registry.snapshot()) + "\n")
+        except OSError as e:
+            print(f"Metrik dosyası yazılamadı: {e}")
+    
+    def rotate(self):
+        backups = self.config["metrics_jsonl_backups"]
+        for index in range(backups - 1, 0, -1):
+            source = self.jsonl_path.with_name(f"{self.jsonl_path.name}.{index}")
+            if source.exists():
+                os.replace(source, self.jsonl_path.with_name(f"{self.jsonl_path.name}.{index + 1}"))
+        if backups > 0:
+            os.replace(self.jsonl_path, self.jsonl_path.with_name(f"{self.jsonl_path.name}.1"))
+        else:
+            self.jsonl_path.unlink()
+    
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+class Trace:
+    """Bir indirmenin aramadan ilk bayta kadar aşama süreleri.
+    
+    Zaman damgaları time.monotonic() ile alınır. started, kullanıcının
+    arama/indir butonuna tıkladığı andır (yeniden bağlanılan indirmelerde None).
+    """
+    def __init__(self, started=None):
+        self.started = started
+        self.spans = {}  # {phase: (start, end)}
+    
+    def span(self, phase, start, end):
+        self.spans[phase] = (start, end)
+    
+    def fork(self):
+        """Aynı aramadan başlatılan her indirme için ayrı bir kopya"""
+        trace = Trace(self.started)
+        trace.spans = dict(self.spans)
+        return trace
+    
+    def durations(self):
+        durations = {phase: end - start for phase, (start, end) in self.spans.items()}
+        first_payload = self.spans.get("first_payload")
+        if self.started is not None and first_payload is not None:
+            durations["click_to_first_payload"] = first_payload[1] - self.started
+        return durations
+
+
+class TraceStore:
+    """Biten indirmelerin izlerini APP_DIR/traces.jsonl'de saklar ve özetler"""
+    PHASES = [
+        "search_request", "search_parse", "folder_dialog", "magnet_request", "magnet_parse",
+        "probe", "metadata", "first_peer", "first_payload", "completion", "click_to_first_payload",
+    ]
+    PHASE_LABELS = {
+        "search_request": "Arama isteği",
+        "search_parse": "Arama sonuçlarını ayrıştırma",
+        "folder_dialog": "Klasör seçimi",
+        "magnet_request": "Sayfa isteği",
+        "magnet_parse": "Link çıkarma",
+        "probe": "Parça kontrolü (HTTP)",
+        "metadata": "Metadata bekleme",
+        "first_peer": "İlk peer",
+        "first_payload": "İlk veri baytı",
+        "completion": "Tamamlanma",
+        "click_to_first_payload": "Tıklamadan ilk bayta",
+    }
+    LIMIT = 1000
+    
+    def __init__(self, path=APP_DIR / "traces.jsonl"):
+        self.path = path
+        self.records = []
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self.records.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+        self.records = self.records[-self.LIMIT:]
+    
+    def add(self, download_id, kind, trace, success):
+        record = {
+            "ts": time.time(),
+            "download_id": download_id,
+            "kind": kind,
+            "success": success,
+            "phases": trace.durations(),
+        }
+        self.records.append(record)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if len(self.records) > self.LIMIT:
+                # Dosyayı son LIMIT kayda indir
+                self.records = self.records[-self.LIMIT:]
+                self.path.write_text("".join(json.dumps(r) + "\n" for r in self.records), encoding="utf-8")
+            else:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"İz dosyası yazılamadı: {e}")
+    
+    @staticmethod
+    def percentile(values, q):
+        """En yakın sıra yöntemiyle yüzdelik"""
+        ordered = sorted(values)
+        index = max(0, math.ceil(q / 100.0 * len(ordered)) - 1)
+        return ordered[index]
+    
+    def summary(self):
+        """{phase: (count, p50, p95)}"""
+        summary = {}
+        for phase in self.PHASES:
+            values = [r["phases"][phase] for r in self.records if phase in r["phases"]]
+            if values:
+                summary[phase] = (len(values), self.percentile(values, 50), self.percentile(values, 95))
+        return summary
+    
+    def export(self, path):
+        summary = {
+            phase: {"count": count, "p50": p50, "p95": p95}
+            for phase, (count, p50, p95) in self.summary().items()
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "traces": self.records}, f, indent=2)
+
+
+class AutoTuner:
+    """Session bağlantı sınırlarını ölçümlere göre ayarlayan kontrol döngüsü.
+    
+    Her session_stats_alert'te indirme hızı, peer değişimi, motorun CPU
+    kullanımı ve disk kuyruğu değerlendirilir. CPU veya disk zorlanıyorsa
+    bağlantı sınırı çarpımsal olarak düşürülür; bağlantılar doluyken hız
+    artmaya devam ediyorsa kademeli olarak yükseltilir, artış verim
+    getirmezse geri alınır. Diğer sınırlar bağlantı sınırından türetilir.
+    "manual" modda session ayarlarına dokunulmaz.
+    """
+    LOG_FILE = APP_DIR / "tuning.jsonl"
+    LOG_MAX_BYTES = 1024 * 1024
+    GROWTH = 1.25
+    BACKOFF = 0.7
+    MIN_GAIN = 0.05  # artıştan sonra beklenen en az verim kazancı
+    CEILING_TTL = 300  # verim getirmeyen sınır bu kadar saniye tekrar denenmez
+    CHURN_LIMIT = 0.3  # bir aralıkta kopan peer'ların bağlı peer'lara oranı
+    MIN_CHURN_PEERS = 10  # küçük swarm'larda tek tük kopmaları değişim sayma
+    UPLOAD_PER_SLOT = 20 * 1024  # unchoke slotu başına hedef upload hızı
+    SEED_PEER_CAP = 20
+    MIN_PEER_CAP = 20
+    HARD_MAX_CONNECTIONS = 4000
+    
+    def __init__(self, ses, config):
+        self.ses = ses
+        self.config = config
+        self.enabled = config["tuning"] == "auto"
+        self.min_connections = config["tuning_min_connections"]
+        self.max_connections = max(
+            self.min_connections,
+            config["tuning_max_connections"] or min(self.file_limit() // 2, self.HARD_MAX_CONNECTIONS),
+        )
+        settings = ses.get_settings()
+        self.settings = {
+            name: settings[name]
+            for name in ("connections_limit", "unchoke_slots_limit", "connection_speed")
+        }
+        self.last = None  # (zaman, CPU süresi, sayaçlar)
+        self.grown_from = None  # son artıştan önceki (sınır, hız)
+        self.ceiling = None
+        self.ceiling_until = 0.0
+        self.peer_caps = {}  # {download_id: sınır}
+        self.changes = []  # son değişiklikler (cmd_tuning)
+    
+    @staticmethod
+    def file_limit():
+        """Sürecin açabileceği dosya/soket sayısı"""
+        try:
+            import resource
+            soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+            return soft if soft > 0 else 4096
+        except ImportError:
+            # Windows'ta soket sınırı libtorrent'ın kendi sınırlarıyla belirlenir
+            return 2048
+    
+    def update(self, counters, torrents):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        cpu = time.process_time()
+        previous, self.last = self.last, (now, cpu, counters)
+        if previous is None or now <= previous[0]:
+            return
+        then, cpu_then, before = previous
+        elapsed = now - then
+        
+        def delta(name):
+            return max(0, counters.get(name, 0) - before.get(name, 0))
+        
+        rate = delta("net.recv_payload_bytes") / elapsed
+        upload_rate = delta("net.sent_payload_bytes") / elapsed
+        cpu_load = (cpu - cpu_then) / elapsed
+        disk_queue = counters.get("disk.queued_write_bytes", 0)
+        connected = counters.get("peer.num_peers_connected", 0)
+        disconnected = delta("peer.disconnected_peers")
+        churn = disconnected / max(connected, 1)
+        
+        limit = self.settings["connections_limit"]
+        target, reason = limit, None
+        if cpu_load > self.config["tuning_max_cpu"]:
+            target, reason = limit * self.BACKOFF, f"CPU %{cpu_load * 100:.0f}"
+        elif disk_queue > self.config["tuning_max_disk_queue"]:
+            target, reason = limit * self.BACKOFF, f"disk kuyruğu {format_size(disk_queue)}"
+        elif self.grown_from is not None:
+            previous_limit, previous_rate = self.grown_from
+            self.grown_from = None
+            if rate < previous_rate * (1 + self.MIN_GAIN):
+                target, reason = previous_limit, "artış verim getirmedi"
+                self.ceiling, self.ceiling_until = limit, now + self.CEILING_TTL
+        elif connected >= 0.9 * limit and self.may_grow(limit, now):
+            target, reason = limit * self.GROWTH, f"bağlantılar dolu, ↓{rate / 1000:.0f} KB/s"
+            self.grown_from = (limit, rate)
+        
+        limit = int(min(max(target, self.min_connections), self.max_connections))
+        if reason and limit != self.settings["connections_limit"]:
+            self.apply("connections_limit", limit, reason)
+        
+        # Yarı açık bağlantılar: saniyedeki yeni bağlantı denemesi
+        speed = min(max(limit // 5, 10), 100)
+        speed_reason = "bağlantı sınırı"
+        if disconnected >= self.MIN_CHURN_PEERS and churn > self.CHURN_LIMIT:
+            speed, speed_reason = max(speed // 2, 5), f"peer değişimi %{churn * 100:.0f}"
+        self.apply("connection_speed", speed, speed_reason)
+        
+        slots = min(max(int(upload_rate / self.UPLOAD_PER_SLOT) + 4, 8), max(8, limit // 4))
+        self.apply("unchoke_slots_limit", slots, f"↑{upload_rate / 1000:.0f} KB/s")
+        
+        self.apply_peer_caps(limit, torrents)
+    
+    def may_grow(self, limit, now):
+        """Yakın zamanda verim getirmeyen sınıra tekrar çıkma"""
+        return self.ceiling is None or now > self.ceiling_until or limit * self.GROWTH < self.ceiling
+    
+    def apply(self, name, value, reason):
+        old = self.settings[name]
+        # Küçük oynamalarla ayarları sürekli değiştirme
+        if abs(value - old) < max(2, old // 10):
+            return
+        try:
+            self.ses.apply_settings({name: value})
+        except Exception:
+            return
+        self.settings[name] = value
+        self.log(name, old, value, reason)
+    
+    def apply_peer_caps(self, limit, torrents):
+        """Bağlantı sınırını indirilen torrentler arasında paylaştır"""
+        active = {
+            t.download_id for t in torrents
+            if t.handle is not None and t.admitted and not t.flags & (STATUS_FINISHED | STATUS_PAUSED)
+        }
+        caps = {}
+        for torrent in torrents:
+            if torrent.handle is None:
+                continue
+            if torrent.download_id in active:
+                # Torrentlerin hepsi aynı anda dolmadığı için pay biraz fazla tutulur
+                caps[torrent.download_id] = min(max(int(limit * 1.5 / len(active)), self.MIN_PEER_CAP), limit)
+            elif torrent.flags & STATUS_FINISHED:
+                caps[torrent.download_id] = self.SEED_PEER_CAP
+        
+        changed = {}
+        for torrent in torrents:
+            cap = caps.get(torrent.download_id)
+            if cap is not None and cap != self.peer_caps.get(torrent.download_id):
+                torrent.handle.set_max_connections(cap)
+                changed[torrent.download_id] = cap
+        self.peer_caps = caps
+        if changed:
+            self.log("peer_caps", None, changed, f"{len(active)} aktif indirme")
+    
+    def log(self, name, old, new, reason):
+        change = {"ts": time.time(), "setting": name, "old": old, "new": new, "reason": reason}
+        self.changes = self.changes[-49:] + [change]
+        try:
+            self.LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+            if self.LOG_FILE.exists() and self.LOG_FILE.stat().st_size > self.LOG_MAX_BYTES:
+                os.replace(self.LOG_FILE, self.LOG_FILE.with_suffix(".jsonl.1"))
+            with open(self.LOG_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(change) + "\n")
+        except OSError:
+            pass
+
+
+class StorageMove:
+    """Tamamlanan torrentin dosyalarını geçici diskten son konuma kopyalar.
+    
+    Dosyalar sırayla ve büyük bloklarla kopyalanır; hız sınırı her blokta
+    yeniden okunur, böylece indirmeler başlayınca taşıma hemen yavaşlar.
+    """
+    CHUNK_SIZE = 1024 * 1024
+    TEMP_SUFFIX = ".fgrmove"
+    
+    def __init__(self, source, target, rate_limit):
+        self.source = Path(source)
+        self.target = Path(target)
+        self.rate_limit = rate_limit  # bayt/s döndüren fonksiyon (0 = sınırsız)
+        self.total = 0
+        self.done = 0
+        self.started = time.monotonic()
+        self.error = None
+        self.cancelled = False
+        self.finished = False
+        self.window = (None, 0.0, 0)  # (sınır, başlangıç, bayt)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+    
+    def run(self):
+        try:
+            files = [Path(root) / name for root, _, names in os.walk(self.source) for name in names]
+            self.total = sum(path.stat().st_size for path in files)
+            for path in files:
+                destination = self.target / path.relative_to(self.source)
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                temp = destination.with_name(destination.name + self.TEMP_SUFFIX)
+                with open(path, "rb") as src, open(temp, "wb") as dst:
+                    while not self.cancelled:
+                        chunk = src.read(self.CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        dst.write(chunk)
+                        self.done += len(chunk)
+                        self.throttle(len(chunk))
+                if self.cancelled:
+                    temp.unlink()
+                    return
+                os.replace(temp, destination)
+        except OSError as e:
+            self.error = str(e)
+        finally:
+            self.finished = True
+    
+    def throttle(self, size):
+        limit = self.rate_limit()
+        now = time.monotonic()
+        window_limit, start, sent = self.window
+        if limit != window_limit:
+            start, sent = now, 0
+        sent += size
+        self.window = (limit, start, sent)
+        if limit:
+            delay = sent / limit - (now - start)
+            if delay > 0:
+                time.sleep(delay)
+    
+    def progress(self):
+        elapsed = time.monotonic() - self.started
+        return {"done": self.done, "total": self.total, "rate": self.done / elapsed if elapsed else 0.0}
+
+
+class EngineTorrent:
+    """Motordaki tek bir torrentin durumu"""
+    def __init__(self, download_id, magnet_url, save_path, handle, storage_path=None):
+        self.download_id = download_id
+        self.magnet_url = magnet_url
+        self.save_path = save_path  # kullanıcının seçtiği son konum
+        self.storage_path = storage_path or save_path  # dosyaların şu anki yeri
+        self.handle = handle
+        self.move = None
+        self.metadata_deadline = time.monotonic() + TorrentEngine.METADATA_TIMEOUT
+        self.flags = 0
+        self.last = (0, 0.0, 0.0, 0.0, 0, 0, 0, 0)
+        self.error = None
+        self.num_pieces = 0
+        self.uploaded = 0
+        self.finished_at = None
+        self.throttled = False  # indirme sürerken seed upload'u kısıldı
+        self.admitted = False  # disk ön kontrolünden geçti
+        self.volume = None
+        self.final_volume = None
+        self.keep_scratch = False  # taşıma hatasında dosyalar geçici diskte bırakılır
+        self.piece_map = None  # (done, available) önbelleği
+        self.piece_map_at = 0.0
+        self.piece_map_key = None  # (indirilen bayt, peer sayısı) değişmediyse yeniden hesaplanmaz
+        self.next_preflight = 0.0
+        self.added_at = time.monotonic()
+        self.milestones = {}  # {phase: eklenmeden itibaren saniye}
+
+
+class TorrentEngine:
+    """Tüm torrentleri tek bir libtorrent session'ında yöneten motor.
+    
+    Arayüzden ayrı bir süreçte çalışır; komutları ENGINE_ADDRESS üzerinden
+    alır, torrent durumlarını StatusRing'e yazar. Arayüz kapanıp yeniden
+    açıldığında indirmeler kesilmeden devam eder.
+    """
+    METADATA_TIMEOUT = 120
+    IDLE_EXIT_AFTER = 60
+    PREFLIGHT_RETRY = 5  # saniye, diskte yer bekleyen torrentler için
+    PIECE_MAP_INTERVAL = 5.0  # saniye, torrent başına parça haritası yenileme aralığı
+    PIECE_MAP_BUDGET = 0.01  # saniye, tick başına parça haritası hesaplama süresi
+    
+    def __init__(self):
+        self.config = load_config()
+        self.ses = create_session(self.config["session_settings"])
+        self.torrents = {}  # {download_id: EngineTorrent}
+        self.handles = {}  # {torrent_handle: EngineTorrent}
+        self.lock = threading.Lock()
+        self.ring = StatusRing.create()
+        self.clients = 0
+        self.running = True
+        self.idle_since = time.monotonic()
+        self.metrics = MetricsRegistry("engine")
+        self.exporter = MetricsExporter(self.metrics, self.config)
+        self.tuner = AutoTuner(self.ses, self.config)
+        self.next_session_stats = 0.0
+        self.next_scratch = 0
+        self.downloading = False
+        self.move_queue = deque()
+        self.active_move = None
+        self.scratch_cleanup = []  # silinecek geçici disk klasörleri
+        # Taşıma tamamlandı/başarısız alert'leri için
+        self.ses.apply_settings({"alert_mask": int(
+            lt.alert.category_t.error_notification | lt.alert.category_t.storage_notification
+        )})
+    
+    def serve(self):
+        # Anahtarı ve soketi yalnızca bu kullanıcı okuyabilmeli
+        APP_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if os.name == "posix":
+            os.chmod(APP_DIR, 0o700)
+        authkey = os.urandom(32)
+        if ENGINE_FAMILY == "AF_UNIX" and os.path.exists(ENGINE_ADDRESS):
+            os.unlink(ENGINE_ADDRESS)
+        listener = Listener(ENGINE_ADDRESS, family=ENGINE_FAMILY, authkey=authkey)
+        tmp_key = ENGINE_KEY_FILE.with_suffix(".tmp")
+        if tmp_key.exists():
+            tmp_key.unlink()
+        fd = os.open(tmp_key, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(authkey)
+        os.replace(tmp_key, ENGINE_KEY_FILE)
+        threading.Thread(target=self._accept_loop, args=(listener,), daemon=True).start()
+        self.exporter.start()
+        
+        try:
+            while self.running:
+                with self.lock:
+                    self.tick()
+                    # Seed'i biten veya başarısız olan torrentler (handle'ı yok) motoru açık tutmaz
+                    if (self.clients or self.pending_moves()
+                            or any(not t.flags & (STATUS_RETIRED | STATUS_FAILED) for t in self.torrents.values())):
+                        self.idle_since = time.monotonic()
+                    elif time.monotonic() - self.idle_since > self.IDLE_EXIT_AFTER:
+                        break
+                time.sleep(ENGINE_TICK)
+        finally:
+            listener.close()
+            self.exporter.close()
+            self.ring.close(unlink=True)
+            try:
+                ENGINE_KEY_FILE.unlink()
+            except OSError:
+                pass
+            # Soket ve anahtar bırakıldı; yeni motor başlarken taşımalar burada biter
+            self.finish_moves()
+            # libtorrent dosyaları kapatırken klasörler hemen silinemeyebilir
+            for _ in range(10):
+                self.clean_scratch()
+                if not self.scratch_cleanup:
+                    break
+                time.sleep(0.5)
+    
+    def _accept_loop(self, listener):
+        while self.running:
+            try:
+                conn = listener.accept()
+            except (AuthenticationError, EOFError):
+                continue
+            except OSError:
+                return
+            threading.Thread(target=self._client_loop, args=(conn,), daemon=True).start()
+    
+    def _client_loop(self, conn):
+        with self.lock:
+            self.clients += 1
+        try:
+            while True:
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    break
+                cmd = message.pop("cmd", None)
+                handler = getattr(self, f"cmd_{cmd}", None)
+                if handler is None:
+                    reply = {"ok": False, "error": f"Bilinmeyen komut: {cmd}"}
+                else:
+                    try:
+                        with self.lock:
+                            reply = {"ok": True, "result": handler(**message)}
+                    except Exception as e:
+                        reply = {"ok": False, "error": str(e)}
+                try:
+                    conn.send(reply)
+                except OSError:
+                    break
+        finally:
+            with self.lock:
+                self.clients -= 1
+            conn.close()
+    
+    def tick(self):
+        """Toplu durum güncellemelerini işle ve tüm torrentleri halka tampona yaz"""
+        self.handle_alerts()
+        now = time.monotonic()
+        self.apply_seeding_policy(now)
+        self.advance_moves()
+        self.clean_scratch()
+        for torrent in list(self.torrents.values()):
+            if (torrent.handle is not None and not torrent.flags & STATUS_HAS_METADATA
+                    and now > torrent.metadata_deadline):
+                self._fail(torrent, f"Metadata alınamadı (timeout - {self.METADATA_TIMEOUT}s)")
+            elif torrent.flags & STATUS_QUEUED and now >= torrent.next_preflight:
+                self._preflight(torrent)
+            self.ring.append(torrent.download_id, torrent.last[0], torrent.flags, *torrent.last[1:])
+        
+        self.refresh_piece_maps(now)
+        
+        # Değişen torrentlerin durumu tek bir state_update_alert ile bir sonraki tick'te gelir
+        self.ses.post_torrent_updates()
+        if now >= self.next_session_stats:
+            # Sonuç session_stats_alert olarak bir sonraki tick'te gelir
+            self.next_session_stats = now + self.config["metrics_interval"]
+            self.ses.post_session_stats()
+        self.exporter.tick()
+    
+    def handle_alerts(self):
+        for alert in self.ses.pop_alerts():
+            if isinstance(alert, lt.state_update_alert):
+                for s in alert.status:
+                    torrent = self.handles.get(s.handle)
+                    if torrent is not None:
+                        self._update(torrent, s)
+            elif isinstance(alert, (lt.storage_moved_alert, lt.storage_moved_failed_alert)):
+                torrent = self.handles.get(alert.handle)
+                if torrent is not None:
+                    self._storage_moved(torrent, alert)
+            elif isinstance(alert, lt.session_stats_alert):
+                self.metrics.update_session(alert.values)
+                self.tuner.update(alert.values, list(self.torrents.values()))
+    
+    def _update(self, torrent, s):
+        has_metadata = s.has_metadata if hasattr(s, 'has_metadata') else s.state >= 3
+        if has_metadata:
+            torrent.flags |= STATUS_HAS_METADATA
+        
+        torrent.last = (
+            s.state, s.progress, float(s.download_rate), float(s.upload_rate),
+            s.num_peers, s.num_seeds, s.total_wanted_done, s.total_wanted,
+        )
+        torrent.uploaded = s.all_time_upload
+        if has_metadata and (s.state == lt.torrent_status.seeding or s.progress >= 1.0):
+            torrent.flags |= STATUS_FINISHED
+            if torrent.finished_at is None:
+                torrent.finished_at = time.monotonic()
+                if torrent.storage_path != torrent.save_path:
+                    torrent.flags |= STATUS_MOVING
+                    self.move_queue.append(torrent)
+        
+        elapsed = time.monotonic() - torrent.added_at
+        if has_metadata:
+            torrent.milestones.setdefault("metadata", elapsed)
+        if s.num_peers:
+            torrent.milestones.setdefault("first_peer", elapsed)
+        if s.total_payload_download:
+            torrent.milestones.setdefault("first_payload", elapsed)
+        if torrent.flags & STATUS_FINISHED:
+            torrent.milestones.setdefault("completion", elapsed)
+        
+        if has_metadata and not torrent.num_pieces:
+            info = torrent.handle.torrent_file()
+            if info is not None:
+                torrent.num_pieces = info.num_pieces()
+        
+        if has_metadata and not torrent.admitted and not torrent.flags & STATUS_QUEUED:
+            self._preflight(torrent)
+            if torrent.handle is None:
+                return
+        
+        state = TORRENT_STATES[s.state] if s.state < len(TORRENT_STATES) else f"unknown({s.state})"
+        if torrent.flags & STATUS_QUEUED:
+            state = "queued for disk"
+        elif torrent.flags & STATUS_PAUSED:
+            state = "paused"
+        self.metrics.update_download(
+            torrent.download_id, "torrent", state,
+            download_rate_bytes=s.download_rate,
+            upload_rate_bytes=s.upload_rate,
+            total_bytes=s.total_wanted,
+            done_bytes=s.total_wanted_done,
+            peers=s.num_peers,
+            seeds=s.num_seeds,
+            pieces_total=torrent.num_pieces,
+            pieces_done=s.num_pieces,
+            wasted_bytes=s.total_failed_bytes,
+            redundant_bytes=s.total_redundant_bytes,
+        )
+    
+    def _preflight(self, torrent):
+        """Metadata geldikten sonra indirmenin diske sığıp sığmadığını kontrol et.
+        
+        Torrentler upload modunda eklenir, yani kontrol geçilene kadar diske
+        hiçbir şey yazılmaz. Boş alan aynı birimdeki diğer indirmelerin
+        henüz yazmadığı baytlar düşülerek hesaplanır; hiç sığmayan indirme
+        reddedilir, diğerlerinin ayırdığı alan yüzünden sığmayan sıraya alınır.
+        """
+        min_free = self.config["min_free_space"]
+        try:
+            torrent.volume = os.stat(torrent.storage_path).st_dev
+            # (gereken, boş, birim, hata mesajı)
+            checks = [(
+                torrent.last[7] - torrent.last[6],
+                shutil.disk_usage(torrent.storage_path).free - min_free,
+                torrent.volume,
+                "Yetersiz disk alanı",
+            )]
+            if torrent.storage_path != torrent.save_path:
+                # Geçici diskten taşınacak dosyaların tamamı son konuma sığmalı
+                torrent.final_volume = os.stat(torrent.save_path).st_dev
+                checks.append((
+                    torrent.last[7],
+                    shutil.disk_usage(torrent.save_path).free - min_free,
+                    torrent.final_volume,
+                    "Son konumda yetersiz disk alanı",
+                ))
+        except OSError as e:
+            self._fail(torrent, f"İndirme klasörüne erişilemedi: {str(e)}")
+            return
+        
+        for needed, free, _, message in checks:
+            if needed > free:
+                self._fail(torrent, f"{message}: {format_size(needed)} gerekli, {format_size(max(free, 0))} boş")
+                return
+        
+        if any(needed > free - self.reserved_bytes(volume) for needed, free, volume, _ in checks):
+            torrent.flags |= STATUS_QUEUED
+            torrent.next_preflight = time.monotonic() + self.PREFLIGHT_RETRY
+            self._set_upload_mode(torrent, True)
+        else:
+            torrent.flags &= ~STATUS_QUEUED
+            torrent.admitted = True
+            self._set_upload_mode(torrent, False)
+    
+    def _set_upload_mode(self, torrent, enabled):
+        try:
+            if enabled:
+                torrent.handle.set_flags(lt.torrent_flags.upload_mode)
+            else:
+                torrent.handle.unset_flags(lt.torrent_flags.upload_mode)
+        except AttributeError:
+            torrent.handle.set_upload_mode(enabled)
+    
+    def available_bytes(self, path):
+        """Birimde yeni indirmelere kalan alan (boş bırakılacak ve ayrılmış alan düşülür)"""
+        volume = os.stat(path).st_dev
+        return shutil.disk_usage(path).free - self.config["min_free_space"] - self.reserved_bytes(volume)
+    
+    def reserved_bytes(self, volume):
+        """Birimdeki kabul edilmiş indirmelerin ve bekleyen taşımaların henüz yazmadığı baytlar"""
+        reserved = 0
+        for torrent in self.torrents.values():
+            if not torrent.admitted or torrent.handle is None or torrent.flags & STATUS_FINISHED:
+                continue
+            # Geçici diskteki torrent son konumda kendi boyutu kadar yer tutar
+            if torrent.final_volume == volume and torrent.storage_path != torrent.save_path:
+                reserved += torrent.last[7]
+            if torrent.volume != volume:
+                continue
+            # Tam ön ayırmada dosyalar ilk yazmada tam boyutta açılır
+            if self.config["preallocate"] and "first_payload" in torrent.milestones:
+                continue
+            reserved += torrent.last[7] - torrent.last[6]
+        # Kaldırılmış olsalar da taşıması süren torrentler
+        for torrent in self.pending_moves():
+            if torrent.final_volume == volume:
+                reserved += torrent.last[7] - (torrent.move.done if torrent.move is not None else 0)
+        return reserved
+    
+    def apply_seeding_policy(self, now):
+        """Seed sınırlarını uygula, indirme sürerken seed upload'unu kıs"""
+        config = self.config
+        seeding = [
+            t for t in self.torrents.values()
+            if t.handle is not None and t.flags & STATUS_FINISHED and not t.flags & (STATUS_PAUSED | STATUS_MOVING)
+        ]
+        
+        for torrent in seeding:
+            total = torrent.last[7]
+            ratio = torrent.uploaded / total if total else 0.0
+            if ((config["seed_ratio"] is not None and ratio >= config["seed_ratio"])
+                    or (config["seed_time"] is not None and now - torrent.finished_at >= config["seed_time"])):
+                self._retire(torrent)
+        
+        # Sınırı aşan seed'lerden en önce tamamlananları bırak
+        seeding = sorted((t for t in seeding if t.handle is not None), key=lambda t: t.finished_at)
+        if config["max_seeding"] is not None:
+            excess = max(0, len(seeding) - config["max_seeding"])
+            for torrent in seeding[:excess]:
+                self._retire(torrent)
+            seeding = seeding[excess:]
+        
+        downloading = self.downloading = any(
+            t.handle is not None and not t.flags & (STATUS_FINISHED | STATUS_PAUSED)
+            for t in self.torrents.values()
+        )
+        for torrent in seeding:
+            if torrent.throttled == downloading:
+                continue
+            torrent.throttled = downloading
+            if downloading:
+                slots = config["seed_upload_slots_while_downloading"]
+                limit = config["seed_upload_limit_while_downloading"]
+                torrent.handle.set_max_uploads(slots if slots is not None else -1)
+                torrent.handle.set_upload_limit(limit or 0)
+            else:
+                torrent.handle.set_max_uploads(-1)
+                torrent.handle.set_upload_limit(0)
+    
+    def _place(self, download_id, save_path):
+        """İndirmenin yazılacağı geçici klasörü seç (geçici disk yoksa son konum)"""
+        dirs = self.config["scratch_dirs"]
+        if not dirs:
+            return save_path
+        
+        if self.config["scratch_placement"] == "round_robin":
+            base = dirs[self.next_scratch % len(dirs)]
+            self.next_scratch += 1
+        else:
+            def available(path):
+                try:
+                    return shutil.disk_usage(path).free - self.reserved_bytes(os.stat(path).st_dev)
+                except OSError:
+                    return -1
+            base = max(dirs, key=available)
+        Path(base).mkdir(parents=True, exist_ok=True)
+        return tempfile.mkdtemp(prefix=f"{INSTANCE_NAME}-{download_id}-", dir=base)
+    
+    def move_rate_limit(self):
+        if self.downloading:
+            return self.config["move_rate_limit_while_downloading"]
+        return self.config["move_rate_limit"]
+    
+    def advance_moves(self):
+        """Geçici diskteki tamamlanmış torrentleri sırayla (tek tek) son konuma kopyala"""
+        torrent = self.active_move
+        if torrent is not None:
+            if not torrent.move.finished:
+                return
+            self.active_move = None
+            if torrent.move.error:
+                if torrent.handle is not None:
+                    self._fail(torrent, f"Taşıma hatası: {torrent.move.error} - dosyalar {torrent.storage_path} içinde",
+                               keep_files=True)
+            elif torrent.handle is not None:
+                # Dosyalar zaten kopyalandı, libtorrent yalnızca yeni konuma geçer
+                flags = getattr(lt.move_flags_t, "reset_save_path_unchecked", lt.move_flags_t.dont_replace)
+                torrent.handle.move_storage(torrent.save_path, flags)
+            else:
+                # Session'dan çıkarılmış (durdurulan/seed'i biten) torrent
+                self._move_done(torrent)
+        
+        while self.move_queue and self.active_move is None:
+            torrent = self.move_queue.popleft()
+            if torrent.flags & STATUS_FAILED:
+                continue
+            torrent.move = StorageMove(torrent.storage_path, torrent.save_path, self.move_rate_limit)
+            torrent.move.thread.start()
+            self.active_move = torrent
+    
+    def _storage_moved(self, torrent, alert):
+        if isinstance(alert, lt.storage_moved_failed_alert):
+            self._fail(torrent, f"Taşıma hatası: {alert.message()} - dosyalar {torrent.storage_path} içinde",
+                       keep_files=True)
+            return
+        self._move_done(torrent)
+    
+    def _move_done(self, torrent):
+        scratch, torrent.storage_path = torrent.storage_path, torrent.save_path
+        torrent.flags &= ~STATUS_MOVING
+        self._discard_scratch(scratch)
+    
+    def pending_moves(self):
+        """Son konuma taşınmayı bekleyen veya taşınmakta olan torrentler"""
+        pending = [t for t in self.move_queue if not t.flags & STATUS_FAILED]
+        if self.active_move is not None:
+            pending.append(self.active_move)
+        return pending
+    
+    def finish_moves(self):
+        """Kapanırken bekleyen taşımaları tamamla; tamamlanmış oyunlar geçici diskte kalmasın"""
+        self.downloading = False
+        while self.pending_moves():
+            with self.lock:
+                self.advance_moves()
+            time.sleep(ENGINE_TICK)
+    
+    def _retire(self, torrent):
+        """Seed sınırına ulaşan torrenti session'dan çıkar; yalnızca küçük kaydı kalır"""
+        torrent.flags |= STATUS_RETIRED
+        self._remove_handle(torrent)
+        state, progress, _, _, _, _, done, wanted = torrent.last
+        torrent.last = (state, progress, 0.0, 0.0, 0, 0, done, wanted)
+        self.metrics.update_download(torrent.download_id, "torrent", "retired")
+    
+    def _fail(self, torrent, error, keep_files=False):
+        torrent.error = error
+        torrent.flags |= STATUS_FAILED
+        torrent.keep_scratch = torrent.keep_scratch or keep_files
+        self._remove_handle(torrent, discard=True)
+        self.metrics.update_download(torrent.download_id, "torrent", "failed")
+    
+    def _remove_handle(self, torrent, discard=False):
+        """Torrenti session'dan çıkar; discard=True ise yarım kalan indirmenin geçici disk klasörünü de sil.
+        
+        Tamamlanmış torrentin son konuma taşınması handle olmadan da sürer.
+        """
+        on_scratch = torrent.storage_path != torrent.save_path
+        if not torrent.flags & STATUS_FINISHED or torrent.flags & STATUS_FAILED:
+            if torrent.move is not None:
+                torrent.move.cancelled = True
+        elif on_scratch:
+            discard = False
+        discard = discard and on_scratch and not torrent.keep_scratch
+        if torrent.handle is not None:
+            self.handles.pop(torrent.handle, None)
+            try:
+                self.ses.remove_torrent(torrent.handle, lt.session.delete_files if discard else 0)
+            except:
+                pass
+            torrent.handle = None
+        if discard:
+            self._discard_scratch(torrent.storage_path)
+    
+    def _discard_scratch(self, path):
+        """Klasörü silinecekler listesine ekle; kilitliyse sonraki tick'lerde yeniden denenir"""
+        if path not in self.scratch_cleanup:
+            self.scratch_cleanup.append(path)
+    
+    def clean_scratch(self):
+        for path in list(self.scratch_cleanup):
+            shutil.rmtree(path, ignore_errors=True)
+            if not os.path.exists(path):
+                self.scratch_cleanup.remove(path)
+    
+    def _get(self, download_id):
+        torrent = self.torrents.get(download_id)
+        if torrent is None:
+            raise KeyError(f"İndirme #{download_id} bulunamadı")
+        return torrent
+    
+    # Komutlar
+    
+    def cmd_hello(self):
+        return {"shm_name": ENGINE_SHM_NAME, "pid": os.getpid()}
+    
+    def cmd_add(self, download_id, magnet_url, save_path):
+        if download_id in self.torrents:
+            raise ValueError(f"İndirme #{download_id} zaten var")
+        
+        # İndirme klasörünün var olduğundan emin ol
+        Path(save_path).mkdir(parents=True, exist_ok=True)
+        
+        storage_path = self._place(download_id, save_path)
+        if self.config["preallocate"]:
+            storage_mode = lt.storage_mode_t.storage_mode_allocate
+        else:
+            storage_mode = lt.storage_mode_t(2)
+        
+        # Magnet link'i ekle
+        try:
+            # Yeni API: add_torrent ile magnet link ekle
+            params = lt.add_torrent_params()
+            params.url = magnet_url
+            params.save_path = storage_path
+            params.storage_mode = storage_mode
+            # Disk ön kontrolü geçilene kadar yalnızca metadata indirilir. Otomatik
+            # yönetilen torrentler bir süre sonra upload modundan kendiliğinden
+            # çıkarıldığı için sıralamayı motor yapar (pause/resume de böylece kalıcı olur)
+            params.flags |= lt.torrent_flags.upload_mode
+            params.flags &= ~(lt.torrent_flags.auto_managed | lt.torrent_flags.paused)
+            handle = self.ses.add_torrent(params)
+        except (AttributeError, TypeError):
+            # Eski API fallback
+            params = {
+                'save_path': storage_path,
+                'storage_mode': storage_mode,
+            }
+            handle = lt.add_magnet_uri(self.ses, magnet_url, params)
+            handle.auto_managed(False)
+            handle.set_upload_mode(True)
+        
+        self.torrents[download_id] = self.handles[handle] = EngineTorrent(
+            download_id, magnet_url, save_path, handle, storage_path
+        )
+    
+    def cmd_pause(self, download_id):
+        torrent = self._get(download_id)
+        if torrent.handle is not None:
+            torrent.handle.pause()
+            torrent.flags |= STATUS_PAUSED
+    
+    def cmd_resume(self, download_id):
+        torrent = self._get(download_id)
+        if torrent.handle is not None:
+            torrent.handle.resume()
+            torrent.flags &= ~STATUS_PAUSED
+    
+    def cmd_stop(self, download_id):
+        """Torrenti session'dan kaldır ve unut (seçilen klasördeki dosyalar silinmez, tamamlanmışsa taşıma sürer)"""
+        torrent = self.torrents.pop(download_id, None)
+        if torrent is not None:
+            self._remove_handle(torrent, discard=True)
+        self.metrics.remove_download(download_id)
+    
+    def cmd_info(self, download_id):
+        torrent = self._get(download_id)
+        return {
+            "error": torrent.error,
+            "flags": torrent.flags,
+            "milestones": dict(torrent.milestones),
+            "move": torrent.move.progress() if torrent.move is not None and torrent.flags & STATUS_MOVING else None,
+        }
+    
+    def cmd_disk_available(self, path):
+        """Doğrudan indirmelerin torrentlere ayrılmış alanı kullanmaması için"""
+        return self.available_bytes(path)
+    
+    def refresh_piece_maps(self, now):
+        """Eskiyen parça haritalarını en eskiden başlayarak, tick başına süre bütçesiyle yenile"""
+        stale = [
+            t for t in self.torrents.values()
+            if t.handle is not None and t.flags & STATUS_HAS_METADATA
+            and not t.flags & (STATUS_PAUSED | STATUS_QUEUED | STATUS_FINISHED)
+            and now - t.piece_map_at >= self.PIECE_MAP_INTERVAL
+        ]
+        deadline = time.monotonic() + self.PIECE_MAP_BUDGET
+        for torrent in sorted(stale, key=lambda t: t.piece_map_at):
+            if time.monotonic() > deadline:
+                break
+            torrent.piece_map_at = now
+            key = (torrent.last[6], torrent.last[4])
+            if torrent.piece_map is not None and key == torrent.piece_map_key:
+                continue
+            torrent.piece_map_key = key
+            s = torrent.handle.status(lt.status_flags_t.query_pieces)
+            torrent.piece_map = bucket_piece_map(s.pieces, torrent.handle.piece_availability())
+    
+    def cmd_piece_maps(self):
+        """Torrentlerin önbellekteki kovalanmış parça haritaları (hesaplama tick'te yapılır)"""
+        maps = {}
+        for torrent in self.torrents.values():
+            if torrent.flags & STATUS_FINISHED:
+                maps[torrent.download_id] = (b"\xff" * PIECE_MAP_BUCKETS, b"\xff" * PIECE_MAP_BUCKETS)
+            elif torrent.piece_map is not None:
+                maps[torrent.download_id] = torrent.piece_map
+        return maps
+    
+    def cmd_tuning(self):
+        tuner = self.tuner
+        return {
+            "mode": self.config["tuning"],
+            "settings": dict(tuner.settings),
+            "peer_caps": dict(tuner.peer_caps),
+            "changes": list(tuner.changes),
+        }
+    
+    def cmd_metrics(self):
+        return self.metrics.snapshot()
+    
+    def cmd_list(self):
+        return [
+            {"download_id": t.download_id, "magnet_url": t.magnet_url, "save_path": t.save_path, "flags": t.flags}
+            for t in self.torrents.values()
+        ]
+    
+    def cmd_shutdown(self):
+        for torrent in self.torrents.values():
+            self._remove_handle(torrent, discard=True)
+        self.torrents.clear()
+        self.running = False
+
+
+def run_engine():
+    """--engine ile başlatılan motor sürecinin giriş noktası"""
+    if not LIBTORRENT_AVAILABLE:
+        sys.exit(1)
+    # Zaten çalışan bir motor varsa ikincisini başlatma
+    existing = EngineClient.try_connect()
+    if existing is not None:
+        existing.close()
+        return
+    TorrentEngine().serve()
+
+
+def spawn_engine():
+    """Motor sürecini arayüzden bağımsız olarak başlat"""
+    if getattr(sys, "frozen", False) or "__compiled__" in globals():
+        command = [sys.argv[0], "--engine"]
+    else:
+        command = [sys.executable, os.path.abspath(__file__), "--engine"]
+    
+    kwargs = {}
+    if sys.platform == "win32":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+        **kwargs
+    )
+
+
+class EngineClient:
+    """Motor sürecine komut bağlantısı ve durum halkası okuyucusu.
+    
+    Bir istemci tüm indirme thread'leri tarafından paylaşılır; halka tampon
+    her POLL_INTERVAL'da bir kez taranır ve her indirmenin son kaydı tutulur.
+    """
+    CONNECT_TIMEOUT = 15
+    POLL_INTERVAL = 0.25
+    STALL_TIMEOUT = 10
+    
+    def __init__(self, conn):
+        self.conn = conn
+        self.lock = threading.Lock()
+        self.poll_lock = threading.Lock()
+        info = self.request("hello")
+        self.pid = info["pid"]
+        self.ring = StatusRing.attach(info["shm_name"])
+        self.cursor = 0
+        self.latest = {}  # {download_id: StatusRecord}
+        self.last_poll = 0.0
+        self.last_progress = time.monotonic()
+        self.dead = False  # motor çöktü veya bağlantı koptu; yeni istemci gerekir
+    
+    @classmethod
+    def try_connect(cls):
+        try:
+            authkey = ENGINE_KEY_FILE.read_bytes()
+            conn = Client(ENGINE_ADDRESS, family=ENGINE_FAMILY, authkey=authkey)
+        except (OSError, EOFError, AuthenticationError):
+            return None
+        try:
+            return cls(conn)
+        except Exception:
+            conn.close()
+            return None
+    
+    @classmethod
+    def connect(cls, spawn=False):
+        """Çalışan motora bağlan; spawn=True ise gerekirse motoru başlat"""
+        client = cls.try_connect()
+        if client is not None or not spawn:
+            return client
+        
+        spawn_engine()
+        deadline = time.monotonic() + cls.CONNECT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(0.2)
+            client = cls.try_connect()
+            if client is not None:
+                return client
+        return None
+    
+    def request(self, cmd, **kwargs):
+        with self.lock:
+            try:
+                self.conn.send(dict(kwargs, cmd=cmd))
+                reply = self.conn.recv()
+            except (EOFError, OSError) as e:
+                self.dead = True
+                raise ConnectionError(f"İndirme motoru bağlantısı koptu: {str(e)}")
+        if not reply["ok"]:
+            raise RuntimeError(reply["error"])
+        return reply["result"]
+    
+    def status(self, download_id):
+        """İndirmenin son durum kaydını döndür (yoksa None)"""
+        with self.poll_lock:
+            now = time.monotonic()
+            if now - self.last_poll >= self.POLL_INTERVAL:
+                self.last_poll = now
+                records, head = self.ring.read_since(self.cursor)
+                if head != self.cursor:
+                    self.last_progress = now
+                elif self.latest and now - self.last_progress > self.STALL_TIMEOUT:
+                    self.dead = True
+                    raise ConnectionError("İndirme motoru yanıt vermiyor")
+                self.cursor = head
+                for record in records:
+                    self.latest[record.download_id] = record
+            return self.latest.get(download_id)
+    
+    def forget(self, download_id):
+        with self.poll_lock:
+            self.latest.pop(download_id, None)
+    
+    def close(self):
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+        # Halkayı okuyan bir thread varken kapatma
+        with self.poll_lock:
+            self.ring.close()
+
+
+class RateHistory:
+    """İndirme başına sabit boyutlu hız ve peer geçmişi.
+    
+    Örnekler önceden ayrılmış dizilerde dairesel olarak tutulur; satır
+    sayısı ne olursa olsun indirme başına bellek sabittir.
+    """
+    SIZE = 120  # saniyelik örnek sayısı
+    
+    def __init__(self, size=SIZE):
+        self.size = size
+        self.down = array('f', [0.0]) * size
+        self.up = array('f', [0.0]) * size
+        self.peers = array('H', [0]) * size
+        self.index = 0
+        self.count = 0
+    
+    def append(self, down, up, peers):
+        i = self.index
+        self.down[i] = down
+        self.up[i] = up
+        self.peers[i] = min(int(peers), 0xFFFF)
+        self.index = (i + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+    
+    def series(self, values):
+        """En eskiden en yeniye sıralı örnekler"""
+        if self.count < self.size:
+            return values[:self.count]
+        return values[self.index:] + values[:self.index]
+    
+    def latest(self):
+        if not self.count:
+            return 0.0, 0.0, 0
+        i = self.index - 1
+        return self.down[i], self.up[i], self.peers[i]
+
+
 class DownloadThread(QThread):
-    """Torrent indirme thread'i - libtorrent kullanır"""
+    """Torrent indirme thread'i - motor sürecindeki torrenti izler"""
     progress = pyqtSignal(int, str, float, float)  # progress, status, download_speed, upload_speed
     finished = pyqtSignal(str, bool)  # download path, success
     paused = pyqtSignal()
     resumed = pyqtSignal()
     
-    def __init__(self, magnet_url, download_path, download_id):
+    def __init__(self, magnet_url, download_path, download_id, engine=None, attach=False, trace=None, connect=None):
         super().__init__()
         self.magnet_url = magnet_url
         self.download_path = download_path
         self.download_id = download_id
+        self.engine = engine
+        self.connect = connect  # engine verilmediyse motoru bu thread'de bağlayan fonksiyon
+        self.attach = attach  # motorda zaten çalışan torrente yeniden bağlan
+        self.trace = trace or Trace()
+        self.history = RateHistory()
+        self.error_message = None
+        self.added_at = None
         self.stop_requested = False
         self.pause_requested = False
         self.resume_requested = False
+        self.detach_requested = False
         self.is_paused = False
-        self.ses = None
-        self.handle = None
         
     def run(self):
         if not LIBTORRENT_AVAILABLE:
             self.progress.emit(0, "libtorrent kütüphanesi bulunamadı", 0, 0)
             self.finished.emit(self.download_path, False)
             return
+        
+        if self.engine is None and self.connect is not None:
+            # Motoru başlatmak saniyeler sürebilir, arayüz thread'ini bekletme
+            self.progress.emit(0, "⚙ İndirme motoru başlatılıyor...", 0, 0)
+            self.engine = self.connect()
+        
+        if self.engine is None:
+            self.progress.emit(0, "İndirme motoruna bağlanılamadı", 0, 0)
+            self.finished.emit(self.download_path, False)
+            return
             
         try:
-            # libtorrent session oluştur
-            self.ses = lt.session()
-            
-            # Ayarları tek tek dene (bazıları mevcut olmayabilir)
-            settings_to_try = {
-                'enable_dht': True,
-                'enable_lsd': True,
-                'enable_upnp': True,
-                'enable_natpmp': True,
-                'listen_interfaces': '0.0.0.0:6881',
-            }
-            
-            # PEX ayarını dene (bazı sürümlerde farklı isimle olabilir)
-            pex_variants = ['enable_pex', 'enable_peer_exchange', 'pex']
-            for pex_name in pex_variants:
-                try:
-                    test_settings = {pex_name: True}
-                    self.ses.apply_settings(test_settings)
-                    settings_to_try[pex_name] = True
-                    break
-                except:
-                    continue
-            
-            # Geçerli ayarları uygula
-            valid_settings = {}
-            for key, value in settings_to_try.items():
-                try:
-                    test_dict = {key: value}
-                    self.ses.apply_settings(test_dict)
-                    valid_settings[key] = value
-                except (KeyError, AttributeError, TypeError):
-                    continue
-            
-            # Tüm geçerli ayarları bir kerede uygula
-            if valid_settings:
-                try:
-                    self.ses.apply_settings(valid_settings)
-                except Exception:
-                    pass
-            
-            # İndirme klasörünün var olduğundan emin ol
-            Path(self.download_path).mkdir(parents=True, exist_ok=True)
-            
-            # Magnet link'i ekle
-            try:
-                # Yeni API: add_torrent ile magnet link ekle
-                params = lt.add_torrent_params()
-                params.url = self.magnet_url
-                params.save_path = self.download_path
-                params.storage_mode = lt.storage_mode_t(2)
-                self.handle = self.ses.add_torrent(params)
-            except (AttributeError, TypeError):
-                # Eski API fallback
-                params = {
-                    'save_path': self.download_path,
-                    'storage_mode': lt.storage_mode_t(2),
-                }
-                self.handle = lt.add_magnet_uri(self.ses, self.magnet_url, params)
-            
-            self.progress.emit(0, "Torrent ekleniyor, metadata bekleniyor...", 0, 0)
-            
-            # Torrent metadata'sını bekle
-            max_wait = 120
-            waited = 0
+            if not self.attach:
+                self.added_at = time.monotonic()
+                self.engine.request(
+                    "add",
+                    download_id=self.download_id,
+                    magnet_url=self.magnet_url,
+                    save_path=self.download_path,
+                )
+                self.progress.emit(0, "Torrent ekleniyor, metadata bekleniyor...", 0, 0)
             
-            # has_metadata() deprecated, status() kullan
-            def has_metadata():
-                try:
-                    status = self.handle.status()
-                    return status.has_metadata if hasattr(status, 'has_metadata') else status.state >= 3
-                except:
-                    # Fallback: eski API
-                    try:
-                        return self.handle.has_metadata()
-                    except:
-                        return False
+            metadata_reported = self.attach
+            synced = not self.attach
             
-            while not has_metadata():
+            while True:
+                # Arayüz kapanıyor, indirme motorda devam eder
+                if self.detach_requested:
+                    return
+                
                 if self.stop_requested:
-                    if self.handle:
-                        try:
-                            self.ses.remove_torrent(self.handle)
-                        except:
-                            pass
+                    try:
+                        self.record_trace(self.engine.request("info", download_id=self.download_id))
+                        self.engine.request("stop", download_id=self.download_id)
+                    except Exception:
+                        pass
+                    self.engine.forget(self.download_id)
                     self.finished.emit(self.download_path, False)
                     return
-                    
+                
+                # Pause/Resume kontrolü
                 if self.pause_requested and not self.is_paused:
                     try:
-                        self.handle.pause()
+                        self.engine.request("pause", download_id=self.download_id)
                         self.is_paused = True
                         self.pause_requested = False
                         self.paused.emit()
                     except Exception:
                         pass
-                    
+                        
                 if self.resume_requested and self.is_paused:
                     try:
-                        self.handle.resume()
+                        self.engine.request("resume", download_id=self.download_id)
                         self.is_paused = False
                         self.resume_requested = False
                         self.resumed.emit()
                     except Exception:
-                        pass
-                
-                waited += 1
-                if waited > max_wait:
-                    error_msg = f"Metadata alınamadı (timeout - {max_wait}s)"
-                    self.progress.emit(0, error_msg, 0, 0)
-                    self.finished.emit(self.download_path, False)
-                    return
-                    
-                self.msleep(1000)
-            
-            self.progress.emit(5, "Metadata alındı, indirme başlıyor...", 0, 0)
-            
-            # İndirme durumunu takip et
-            update_counter = 0
-            
-            while True:
-                try:
-                    if self.stop_requested:
-                        if self.handle:
-                            try:
-                                self.ses.remove_torrent(self.handle)
-                            except:
-                                pass
-                        self.finished.emit(self.download_path, False)
-                        return
-                    
-                    # Pause/Resume kontrolü
-                    if self.pause_requested and not self.is_paused:
-                        try:
-                            self.handle.pause()
-                            self.is_paused = True
-                            self.pause_requested = False
-                            self.paused.emit()
-                        except Exception:
-                            pass
-                            
-                    if self.resume_requested and self.is_paused:
-                        try:
-                            self.handle.resume()
-                            self.is_paused = False
-                            self.resume_requested = False
-                            self.resumed.emit()
-                        except Exception:
-                            pass
-                    
-                    # Status al
-                    try:
-                        s = self.handle.status()
-                    except Exception as e:
-                        self.progress.emit(0, f"Status hatası: {str(e)}", 0, 0)
-                        self.finished.emit(self.download_path, False)
-                        return
-                    
-                    progress = int(s.progress * 100)
-                    
-                    state_str = [
-                        "queued for checking",
-                        "checking files",
-                        "downloading metadata",
-                        "downloading",
-                        "finished",
-                        "seeding",
-                        "allocating",
-                        "checking fastresume"
-                    ]
-                    
-                    state = state_str[s.state] if s.state < len(state_str) else f"unknown({s.state})"
-                    
-                    if self.is_paused:
-                        state = "paused"
-                    
-                    download_speed = s.download_rate / 1000.0  # KB/s
-                    upload_speed = s.upload_rate / 1000.0  # KB/s
-                    
-                    status_msg = f"{state} - {progress}% - ↓{download_speed:.1f} KB/s ↑{upload_speed:.1f} KB/s"
-                    self.progress.emit(progress, status_msg, download_speed, upload_speed)
-                    
-                    if s.state == lt.torrent_status.seeding or progress >= 100:
-                        self.progress.emit(100, "İndirme tamamlandı!", 0, 0)
-                        self.finished.emit(self.download_path, True)
-                        return
-                    
-                    update_counter += 1
-                    self.msleep(1000)
-                    
-                except Exception as e:
-                    self.progress.emit(0, f"Hata: {str(e)}", 0, 0)
+                        pass
+                
+                # Status al
+                s = self.engine.status(self.download_id)
+                if s is None:
+                    self.msleep(500)
+                    continue
+                
+                if not synced:
+                    synced = True
+                    if s.flags & STATUS_PAUSED:
+                        self.is_paused = True
+                        self.paused.emit()
+                
+                if s.flags & STATUS_FAILED:
+                    info = self.engine.request("info", download_id=self.download_id)
+                    self.record_trace(info)
+                    error_msg = self.error_message = info["error"]
+                    self.engine.request("stop", download_id=self.download_id)
+                    self.engine.forget(self.download_id)
+                    self.progress.emit(0, error_msg or "Hata", 0, 0)
                     self.finished.emit(self.download_path, False)
                     return
                 
+                if not s.flags & STATUS_HAS_METADATA:
+                    self.msleep(1000)
+                    continue
+                
+                if s.flags & STATUS_QUEUED:
+                    self.progress.emit(5, "Diskte yer bekleniyor (diğer indirmelere ayrılan alan dolu)...", 0, 0)
+                    self.msleep(1000)
+                    continue
+                
+                if not metadata_reported:
+                    metadata_reported = True
+                    self.progress.emit(5, "Metadata alındı, indirme başlıyor...", 0, 0)
+                
+                if s.flags & STATUS_MOVING:
+                    move = self.engine.request("info", download_id=self.download_id)["move"]
+                    if move and move["total"]:
+                        percent = int(move["done"] * 100 / move["total"])
+                        status_msg = f"📦 Son konuma taşınıyor - {percent}% - {format_size(move['rate'])}/s"
+                    else:
+                        status_msg = "📦 Son konuma taşınmayı bekliyor..."
+                    self.progress.emit(100, status_msg, 0, 0)
+                    self.msleep(1000)
+                    continue
+                
+                progress = int(s.progress * 100)
+                state = TORRENT_STATES[s.state] if s.state < len(TORRENT_STATES) else f"unknown({s.state})"
+                
+                if self.is_paused:
+                    state = "paused"
+                
+                download_speed = s.download_rate / 1000.0  # KB/s
+                upload_speed = s.upload_rate / 1000.0  # KB/s
+                self.history.append(s.download_rate, s.upload_rate, s.num_peers)
+                
+                status_msg = f"{state} - {progress}% - ↓{download_speed:.1f} KB/s ↑{upload_speed:.1f} KB/s"
+                self.progress.emit(progress, status_msg, download_speed, upload_speed)
+                
+                if s.flags & STATUS_FINISHED:
+                    self.record_trace(self.engine.request("info", download_id=self.download_id))
+                    self.progress.emit(100, "İndirme tamamlandı!", 0, 0)
+                    self.finished.emit(self.download_path, True)
+                    return
+                
+                self.msleep(1000)
+                
         except Exception as e:
-            error_msg = f"Hata: {str(e)}"
+            error_msg = self.error_message = f"Hata: {str(e)}"
             self.progress.emit(0, error_msg, 0, 0)
             self.finished.emit(self.download_path, False)
     
+    def record_trace(self, info):
+        """Motorun eklenmeden itibaren ölçtüğü aşamaları ize ekle"""
+        anchor = self.added_at if self.added_at is not None else 0.0
+        for phase, offset in info["milestones"].items():
+            self.trace.span(phase, anchor, anchor + offset)
+    
     def pause(self):
         self.pause_requested = True
     
@@ -262,6 +1868,25 @@ class DownloadThread(QThread):
     
     def stop(self):
         self.stop_requested = True
+    
+    def detach(self):
+        self.detach_requested = True
+
+
+class PieceMapThread(QThread):
+    """Motordan parça haritalarını arayüz thread'ini bekletmeden al"""
+    maps_ready = pyqtSignal(dict)  # {download_id: (done, available)}
+    
+    def __init__(self, engine):
+        super().__init__()
+        self.engine = engine
+    
+    def run(self):
+        try:
+            maps = self.engine.request("piece_maps")
+        except Exception:
+            return
+        self.maps_ready.emit(maps)
 
 
 class SearchThread(QThread):
@@ -269,24 +1894,34 @@ class SearchThread(QThread):
     results_ready = pyqtSignal(list)  # list of (title, url) tuples
     error = pyqtSignal(str)
     
-    def __init__(self, search_query):
+    def __init__(self, search_query, trace=None):
         super().__init__()
         self.search_query = search_query
+        self.trace = trace or Trace(time.monotonic())
+        self.cancelled = False
         
     def run(self):
         try:
             # URL'yi encode et
             encoded_query = quote_plus(self.search_query)
-            search_url = f"https://fitgirl-repacks.site/?s={encoded_query}"
+            search_url = f"{SITE_URL}/?s={encoded_query}"
             
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
             }
             
-            response = requests.get(search_url, headers=headers, timeout=30)
-            response.raise_for_status()
+            request_started = time.monotonic()
+            with requests.get(search_url, headers=headers, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                # Sorgu değiştiyse yanıtın kalanını okumadan bırak
+                content = bytearray()
+                for chunk in response.iter_content(64 * 1024):
+                    if self.cancelled:
+                        return
+                    content += chunk
+            parse_started = time.monotonic()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(bytes(content), 'html.parser')
             
             # entry-title class'ına sahip h1 elementlerini bul
             results = []
@@ -300,20 +1935,31 @@ class SearchThread(QThread):
                     if title and href:
                         results.append((title, href))
             
-            self.results_ready.emit(results)
+            self.trace.span("search_request", request_started, parse_started)
+            self.trace.span("search_parse", parse_started, time.monotonic())
+            if not self.cancelled:
+                self.results_ready.emit(results)
             
         except Exception as e:
-            self.error.emit(f"Arama hatası: {str(e)}")
+            if not self.cancelled:
+                self.error.emit(f"Arama hatası: {str(e)}")
+    
+    def cancel(self):
+        self.cancelled = True
 
 
 class MagnetThread(QThread):
-    """Magnet link bulma thread'i"""
-    magnet_found = pyqtSignal(str)
+    """Magnet ve doğrudan indirme linklerini bulma thread'i"""
+    links_found = pyqtSignal(str, dict)  # magnet url (boş olabilir), aynaya göre doğrudan indirme linkleri
     error = pyqtSignal(str)
     
-    def __init__(self, page_url):
+    # Doğrudan indirme aynalarındaki parça dosyaları
+    DIRECT_LINK_PATTERN = re.compile(r'\.(?:part\d+\.rar|rar|r\d{2}|zip|7z|bin|iso)$', re.I)
+    
+    def __init__(self, page_url, trace=None):
         super().__init__()
         self.page_url = page_url
+        self.trace = trace or Trace(time.monotonic())
         
     def run(self):
         try:
@@ -321,49 +1967,504 @@ class MagnetThread(QThread):
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
             }
             
+            request_started = time.monotonic()
             response = requests.get(self.page_url, headers=headers, timeout=30)
             response.raise_for_status()
+            parse_started = time.monotonic()
             
             soup = BeautifulSoup(response.content, 'html.parser')
             
-            # "magnet" içeren a elementlerini bul
-            magnet_links = soup.find_all('a', href=re.compile(r'magnet:', re.I))
+            magnet_url = self.find_magnet(soup)
+            direct_links = self.find_direct_links(soup)
             
-            if not magnet_links:
-                # Alternatif olarak text içinde "magnet" geçen a elementlerini ara
-                all_links = soup.find_all('a')
-                for link in all_links:
-                    href = link.get('href', '')
-                    text = link.get_text(strip=True).lower()
-                    if 'magnet:' in href.lower():
-                        magnet_links.append(link)
-                        break
-                    elif 'magnet' in text:
-                        # Text içinden magnet linkini çıkar
-                        text_content = str(link)
-                        magnet_match = re.search(r'magnet:[^\s<>"]+', text_content)
-                        if magnet_match:
-                            self.magnet_found.emit(magnet_match.group())
-                            return
+            self.trace.span("magnet_request", request_started, parse_started)
+            self.trace.span("magnet_parse", parse_started, time.monotonic())
             
-            if magnet_links:
-                magnet_url = magnet_links[0].get('href', '')
-                if magnet_url:
-                    self.magnet_found.emit(magnet_url)
-                else:
-                    self.error.emit("Magnet link bulunamadı")
+            if magnet_url or direct_links:
+                self.links_found.emit(magnet_url or "", direct_links)
             else:
                 self.error.emit("Sayfada magnet link bulunamadı")
                 
         except Exception as e:
             self.error.emit(f"Magnet bulma hatası: {str(e)}")
+    
+    def find_magnet(self, soup):
+        # "magnet" içeren a elementlerini bul
+        magnet_links = soup.find_all('a', href=re.compile(r'magnet:', re.I))
+        
+        if not magnet_links:
+            # Alternatif olarak text içinde "magnet" geçen a elementlerini ara
+            all_links = soup.find_all('a')
+            for link in all_links:
+                href = link.get('href', '')
+                text = link.get_text(strip=True).lower()
+                if 'magnet:' in href.lower():
+                    magnet_links.append(link)
+                    break
+                elif 'magnet' in text:
+                    # Text içinden magnet linkini çıkar
+                    text_content = str(link)
+                    magnet_match = re.search(r'magnet:[^\s<>"]+', text_content)
+                    if magnet_match:
+                        return magnet_match.group()
+        
+        if magnet_links:
+            return magnet_links[0].get('href', '') or None
+        return None
+    
+    def find_direct_links(self, soup):
+        """Parçalara bölünmüş doğrudan indirme linklerini aynaya (sunucuya) göre sırayla topla.
+        
+        Aynı parçalar birden çok dosya sunucusunda listelenir; her aynada bir
+        dosya adı yalnızca bir kez alınır.
+        """
+        mirrors = {}
+        for a_tag in soup.find_all('a', href=True):
+            url = urljoin(self.page_url, a_tag['href'])
+            parsed = urlparse(url)
+            if parsed.scheme not in ('http', 'https'):
+                continue
+            filename = self.link_filename(url)
+            if not self.DIRECT_LINK_PATTERN.search(filename):
+                continue
+            links = mirrors.setdefault(parsed.netloc.lower(), {})
+            links.setdefault(filename.lower(), url)
+        return {host: list(links.values()) for host, links in mirrors.items()}
+    
+    @classmethod
+    def link_filename(cls, url):
+        """Linkteki dosya adı; bazı hosting linkleri adı # sonrasında taşır"""
+        parsed = urlparse(url)
+        path_name = unquote(os.path.basename(parsed.path))
+        fragment_name = unquote(os.path.basename(parsed.fragment))
+        if not cls.DIRECT_LINK_PATTERN.search(path_name) and cls.DIRECT_LINK_PATTERN.search(fragment_name):
+            return fragment_name
+        return path_name
+
+
+class HttpDownloadThread(QThread):
+    """Doğrudan indirme thread'i - parçaları çoklu HTTP Range bağlantısıyla indirir.
+    
+    Aynı anda en fazla MAX_PARALLEL_PARTS parça, her parça için en fazla
+    CONNECTIONS_PER_FILE bağlantı kullanılır. Dosyalar önceden ayrılır;
+    segment durumu yan dosyada tutulur, böylece yarıda kalan indirme aynı
+    klasörden yeniden başlatıldığında kaldığı yerden devam eder.
+    """
+    progress = pyqtSignal(int, str, float, float)  # progress, status, download_speed, upload_speed
+    finished = pyqtSignal(str, bool)  # download path, success
+    paused = pyqtSignal()
+    resumed = pyqtSignal()
+    
+    MAX_PARALLEL_PARTS = 3
+    CONNECTIONS_PER_FILE = 4
+    MIN_SEGMENT_SIZE = 4 * 1024 * 1024
+    CHUNK_SIZE = 256 * 1024
+    MAX_RETRIES = 5
+    STATE_SUFFIX = ".fgrdl"
+    PARTIAL_SUFFIX = ".part"
+    
+    def __init__(self, urls, download_path, download_id, metrics=None, trace=None, engine=None, config=None):
+        super().__init__()
+        self.urls = urls
+        self.engine = engine  # çalışan motor varsa disk ayırmaları ondan sorulur
+        self.config = config or DEFAULT_CONFIG
+        self.download_path = download_path
+        self.download_id = download_id
+        self.metrics = metrics
+        self.trace = trace or Trace()
+        self.history = RateHistory()
+        self.error_message = None
+        self.started_at = None
+        self.first_byte_at = None
+        self.stop_requested = False
+        self.pause_requested = False
+        self.resume_requested = False
+        self.is_paused = False
+        self.unpaused = threading.Event()
+        self.unpaused.set()
+        self.lock = threading.Lock()
+        self.bytes_done = 0
+        self.bytes_total = 0
+        self.active_connections = 0
+        self.parts = []
+        self.session = None
+        
+    def run(self):
+        started = self.started_at = time.monotonic()
+        try:
+            Path(self.download_path).mkdir(parents=True, exist_ok=True)
+            
+            self.session = requests.Session()
+            self.session.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+            pool_size = self.MAX_PARALLEL_PARTS * self.CONNECTIONS_PER_FILE
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
+            
+            self.progress.emit(0, f"{len(self.urls)} parça kontrol ediliyor...", 0, 0)
+            parts = self.parts = []
+            for index, url in enumerate(self.urls):
+                parts.append(self.prepare_part(url, index))
+            self.trace.span("probe", started, time.monotonic())
+            self.bytes_total = sum(part['size'] for part in parts)
+            self.bytes_done = sum(part['done'] for part in parts)
+            
+            executor = ThreadPoolExecutor(max_workers=self.MAX_PARALLEL_PARTS)
+            futures = [executor.submit(self.download_part, part) for part in parts if not part['complete']]
+            
+            last_done = self.bytes_done
+            last_time = time.monotonic()
+            while not all(future.done() for future in futures):
+                if self.stop_requested:
+                    self.unpaused.set()
+                    break
+                
+                # Bir parça başarısız olduysa diğerlerini de durdur
+                for future in futures:
+                    if future.done() and future.exception() is not None:
+                        raise future.exception()
+                
+                # Pause/Resume kontrolü
+                if self.pause_requested and not self.is_paused:
+                    self.unpaused.clear()
+                    self.is_paused = True
+                    self.pause_requested = False
+                    self.paused.emit()
+                    
+                if self.resume_requested and self.is_paused:
+                    self.unpaused.set()
+                    self.is_paused = False
+                    self.resume_requested = False
+                    self.resumed.emit()
+                
+                self.msleep(1000)
+                
+                now = time.monotonic()
+                with self.lock:
+                    done = self.bytes_done
+                download_speed = (done - last_done) / (now - last_time) / 1000.0  # KB/s
+                last_done, last_time = done, now
+                self.history.append(download_speed * 1000, 0, self.active_connections)
+                
+                progress = int(done * 100 / self.bytes_total) if self.bytes_total else 0
+                state = "paused" if self.is_paused else "downloading"
+                status_msg = f"{state} - {progress}% - ↓{download_speed:.1f} KB/s ↑0.0 KB/s"
+                self.progress.emit(progress, status_msg, download_speed, 0)
+                self.record_metrics(state, download_speed * 1000, done)
+            
+            executor.shutdown(wait=True)
+            if self.stop_requested:
+                self.record_metrics("stopped", 0, self.bytes_done)
+                self.finished.emit(self.download_path, False)
+                return
+            
+            for future in futures:
+                # Segment hatalarını yukarı taşı
+                future.result()
+            
+            self.record_metrics("finished", 0, self.bytes_done)
+            self.trace.span("completion", started, time.monotonic())
+            self.progress.emit(100, "İndirme tamamlandı!", 0, 0)
+            self.finished.emit(self.download_path, True)
+            
+        except Exception as e:
+            self.stop_requested = True
+            self.unpaused.set()
+            self.record_metrics("failed", 0, self.bytes_done)
+            error_msg = self.error_message = f"Hata: {str(e)}"
+            self.progress.emit(0, error_msg, 0, 0)
+            self.finished.emit(self.download_path, False)
+        finally:
+            if self.session is not None:
+                self.session.close()
+    
+    def record_metrics(self, state, download_rate, done):
+        if self.metrics is not None:
+            self.metrics.update_download(
+                self.download_id, "http", state,
+                download_rate_bytes=download_rate,
+                upload_rate_bytes=0,
+                total_bytes=self.bytes_total,
+                done_bytes=done,
+            )
+    
+    def prepare_part(self, url, index):
+        """Parçanın boyutunu öğren, dosyayı ayır ve segmentleri hazırla"""
+        filename = MagnetThread.link_filename(url) or f"part{index + 1:03d}"
+        target = Path(self.download_path) / filename
+        if any(other['target'] == target for other in self.parts):
+            # Aynı dosyaya iki parça yazarsa birbirlerinin verisini bozarlar
+            raise ValueError(f"Aynı dosya adına sahip birden çok parça: {filename}")
+        partial = target.with_name(target.name + self.PARTIAL_SUFFIX)
+        state_file = target.with_name(target.name + self.STATE_SUFFIX)
+        part = {'url': url, 'target': target, 'partial': partial, 'state_file': state_file, 'lock': threading.Lock()}
+        
+        # Yarıda kalmış parça: segment durumunu yükle
+        if state_file.exists() and partial.exists():
+            try:
+                state = json.loads(state_file.read_text())
+                if state.get('url') == url:
+                    segments = state['segments']
+                    if not state['ranges']:
+                        # Range olmadan kaldığı yerden devam edilemez
+                        segments = [[0, state['size'], 0]]
+                    part.update(size=state['size'], complete=False, segments=segments, ranges=state['ranges'])
+                    part['done'] = sum(seg[2] for seg in segments)
+                    return part
+            except (OSError, ValueError, KeyError):
+                pass
+        
+        response = self.session.head(url, allow_redirects=True, timeout=30)
+        response.raise_for_status()
+        self.check_content_type(response, filename)
+        size = int(response.headers.get('Content-Length', 0))
+        accepts_ranges = response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+        
+        # Daha önce tamamlanmış parça (aynı adlı ama farklı boyutlu dosya yeniden indirilir)
+        if target.exists() and not state_file.exists() and size > 0 and target.stat().st_size == size:
+            part.update(size=size, done=size, complete=True, segments=[], ranges=False)
+            return part
+        
+        # Boş alan her ayırmadan sonra azaldığı için parçalar toplamda kontrol edilmiş olur
+        free = self.available_space()
+        if size > free:
+            raise IOError(f"Yetersiz disk alanı: {filename} için {format_size(size)} gerekli, {format_size(max(free, 0))} kullanılabilir")
+        
+        if size > 0 and accepts_ranges:
+            count = max(1, min(self.CONNECTIONS_PER_FILE, size // self.MIN_SEGMENT_SIZE))
+            step = size // count
+            segments = [[i * step, size if i == count - 1 else (i + 1) * step, 0] for i in range(count)]
+        else:
+            # Range desteklenmiyor: tek bağlantı, devam ettirme yok
+            segments = [[0, size, 0]]
+        
+        with open(partial, 'wb') as f:
+            if size > 0:
+                if hasattr(os, 'posix_fallocate'):
+                    os.posix_fallocate(f.fileno(), 0, size)
+                else:
+                    f.truncate(size)
+        
+        part.update(size=size, done=0, complete=False, segments=segments, ranges=accepts_ranges)
+        self.save_part_state(part)
+        return part
+    
+    def available_space(self):
+        """İndirme klasöründe kullanılabilir alan; torrentlere ayrılmış alan da düşülür"""
+        engine = self.engine
+        if engine is not None and not engine.dead:
+            try:
+                return engine.request("disk_available", path=self.download_path)
+            except Exception:
+                pass
+        return shutil.disk_usage(self.download_path).free - self.config["min_free_space"]
+    
+    @staticmethod
+    def check_content_type(response, filename):
+        """Dosya yerine HTML sayfası (hosting karşılama sayfası vb.) dönen linkleri reddet"""
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type in ('text/html', 'application/xhtml+xml'):
+            # ValueError yeniden denenmez, indirme açık bir hatayla biter
+            raise ValueError(f"{filename} linki dosya yerine bir web sayfası döndürdü; link doğrudan indirme linki değil")
+    
+    def save_part_state(self, part):
+        with part['lock']:
+            with self.lock:
+                state = {
+                    'url': part['url'],
+                    'size': part['size'],
+                    'ranges': part['ranges'],
+                    'segments': [list(seg) for seg in part['segments']],
+                }
+            tmp = part['state_file'].with_name(part['state_file'].name + '.tmp')
+            tmp.write_text(json.dumps(state))
+            os.replace(tmp, part['state_file'])
+    
+    def download_part(self, part):
+        if part['complete']:
+            return
+        
+        pending = [seg for seg in part['segments'] if seg[0] + seg[2] < seg[1] or seg[1] == 0]
+        with ThreadPoolExecutor(max_workers=self.CONNECTIONS_PER_FILE) as executor:
+            for future in [executor.submit(self.download_segment, part, seg) for seg in pending]:
+                future.result()
+        
+        if self.stop_requested:
+            return
+        os.replace(part['partial'], part['target'])
+        part['state_file'].unlink()
+        part['complete'] = True
+    
+    def download_segment(self, part, segment):
+        start, end, _ = segment
+        ranged = part['ranges']
+        retries = 0
+        
+        while not self.stop_requested:
+            offset = start + segment[2]
+            if end and offset >= end:
+                return
+            
+            headers = {'Range': f"bytes={offset}-{end - 1}"} if ranged and end else {}
+            try:
+                with self.session.get(part['url'], headers=headers, stream=True, timeout=30) as response:
+                    response.raise_for_status()
+                    if headers and response.status_code != 206:
+                        raise IOError("Sunucu Range isteğini desteklemiyor")
+                    self.check_content_type(response, part['target'].name)
+                    
+                    with self.lock:
+                        self.active_connections += 1
+                    try:
+                        with open(part['partial'], 'r+b') as f:
+                            f.seek(offset)
+                            for chunk in response.iter_content(self.CHUNK_SIZE):
+                                self.unpaused.wait()
+                                if self.stop_requested:
+                                    break
+                                f.write(chunk)
+                                with self.lock:
+                                    if self.first_byte_at is None:
+                                        self.first_byte_at = time.monotonic()
+                                        self.trace.span("first_payload", self.started_at, self.first_byte_at)
+                                    segment[2] += len(chunk)
+                                    self.bytes_done += len(chunk)
+                                retries = 0
+                    finally:
+                        with self.lock:
+                            self.active_connections -= 1
+                
+                self.save_part_state(part)
+                if not end or self.stop_requested:
+                    return
+                    
+            except (requests.RequestException, IOError):
+                self.save_part_state(part)
+                retries += 1
+                if retries > self.MAX_RETRIES or not ranged:
+                    raise
+                time.sleep(min(2 ** retries, 30))
+    
+    def piece_map(self, buckets=PIECE_MAP_BUCKETS):
+        """Parçaların indirilmiş bölgelerini sabit sayıda kovaya indir"""
+        done = [0.0] * buckets
+        total = self.bytes_total
+        if not total:
+            return bytes(buckets), b"\xff" * buckets
+        
+        ranges = []
+        base = 0
+        with self.lock:
+            for part in self.parts:
+                if part['complete']:
+                    ranges.append((base, base + part['size']))
+                else:
+                    ranges.extend((base + start, base + start + got) for start, _, got in part['segments'])
+                base += part['size']
+        
+        width = total / buckets
+        for lo, hi in ranges:
+            bucket = int(lo / width)
+            while lo < hi and bucket < buckets:
+                edge = min(hi, (bucket + 1) * width)
+                done[bucket] += edge - lo
+                lo = edge
+                bucket += 1
+        # HTTP aynasında her bayt erişilebilir
+        return bytes(min(255, int(value * 255 / width)) for value in done), b"\xff" * buckets
+    
+    def pause(self):
+        self.pause_requested = True
+    
+    def resume(self):
+        self.resume_requested = True
+    
+    def stop(self):
+        self.stop_requested = True
+        self.unpaused.set()
+    
+
+class RateGraph(QWidget):
+    """Satır içi hız/peer sparkline'ı"""
+    DOWN_COLOR = QColor(76, 175, 80)
+    UP_COLOR = QColor(255, 152, 0)
+    PEER_COLOR = QColor(120, 120, 120)
+    
+    def __init__(self, history, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.setFixedHeight(32)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+    
+    def refresh(self):
+        down, up, peers = self.history.latest()
+        self.setToolTip(f"↓{down / 1000:.1f} KB/s ↑{up / 1000:.1f} KB/s - {peers} bağlantı")
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(37, 37, 37))
+        history = self.history
+        if history.count < 2:
+            return
+        
+        down = history.series(history.down)
+        up = history.series(history.up)
+        peers = history.series(history.peers)
+        peak = max(max(down), max(up), 1.0)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.draw_series(painter, peers, max(max(peers), 1), self.PEER_COLOR)
+        self.draw_series(painter, up, peak, self.UP_COLOR)
+        self.draw_series(painter, down, peak, self.DOWN_COLOR)
+    
+    def draw_series(self, painter, values, peak, color):
+        width = self.width() - 1
+        height = self.height() - 2
+        step = width / (self.history.size - 1)
+        offset = width - step * (len(values) - 1)  # en yeni örnek sağda
+        points = QPolygonF([
+            QPointF(offset + i * step, 1 + height - value * height / peak)
+            for i, value in enumerate(values)
+        ])
+        painter.setPen(QPen(color, 1))
+        painter.drawPolyline(points)
+
+
+class PieceStrip(QWidget):
+    """Parçaların indirilme ve erişilebilirlik şeridi"""
+    DONE_COLOR = (76, 175, 80)
+    AVAILABLE_COLOR = (85, 85, 85)
+    MISSING_COLOR = (139, 45, 45)  # hiçbir peer'da yok
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.image = None
+        self.setFixedHeight(6)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+    
+    def set_map(self, done, available):
+        image = QImage(len(done), 1, QImage.Format.Format_RGB32)
+        for x, (have, reach) in enumerate(zip(done, available)):
+            base = [m + (a - m) * reach // 255 for m, a in zip(self.MISSING_COLOR, self.AVAILABLE_COLOR)]
+            r, g, b = (c + (d - c) * have // 255 for c, d in zip(base, self.DONE_COLOR))
+            image.setPixel(x, 0, 0xFF000000 | r << 16 | g << 8 | b)
+        self.image = image
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self.image is None:
+            painter.fillRect(self.rect(), QColor(37, 37, 37))
+            return
+        painter.drawImage(self.rect(), self.image)
 
 
 class DownloadItemWidget(QWidget):
     """İndirme öğesi için özel widget"""
-    def __init__(self, download_id, parent=None):
+    def __init__(self, download_id, history, parent=None):
         super().__init__(parent)
         self.download_id = download_id
+        self.history = history
         self.init_ui()
         
     def init_ui(self):
@@ -404,6 +2505,12 @@ class DownloadItemWidget(QWidget):
         self.progress_bar.setMaximum(100)
         layout.addWidget(self.progress_bar)
         
+        # Parça şeridi ve hız geçmişi
+        self.piece_strip = PieceStrip()
+        layout.addWidget(self.piece_strip)
+        self.rate_graph = RateGraph(self.history)
+        layout.addWidget(self.rate_graph)
+        
         # Status label
         self.status_label = QLabel("Başlatılıyor...")
         self.status_label.setStyleSheet("color: #888; font-size: 9pt;")
@@ -429,10 +2536,27 @@ class DownloadItemWidget(QWidget):
 
 
 class MainWindow(QMainWindow):
+    SEARCH_DEBOUNCE_MS = 400
+    SEARCH_MIN_CHARS = 3
+    SEARCH_CACHE_SIZE = 64
+    SEARCH_CACHE_TTL = 300  # saniye
+    PIECE_MAP_INTERVAL_MS = 5000
+    
     def __init__(self):
         super().__init__()
         self.download_threads = {}  # {download_id: (thread, item_widget, list_item)}
         self.download_counter = 0
+        self.engine = None
+        self.engine_lock = threading.Lock()
+        self.config = load_config()
+        self.metrics = MetricsRegistry("gui")
+        self.metrics_exporter = MetricsExporter(self.metrics, self.config, port_offset=1)
+        self.metrics_exporter.start()
+        self.trace_store = TraceStore()
+        self.search_trace = None
+        self.search_thread = None
+        self.search_threads = set()
+        self.search_cache = OrderedDict()  # {sorgu: (zaman, sonuçlar)}
         self.init_ui()
         
         if not LIBTORRENT_AVAILABLE:
@@ -444,6 +2568,8 @@ class MainWindow(QMainWindow):
                 "pip install python-libtorrent\n\n"
                 "Eğer hala sorun yaşıyorsanız, Windows için Visual C++ Redistributable'ı yükleyin."
             )
+        else:
+            self.reattach_engine()
         
     def init_ui(self):
         self.setWindowTitle("FitGirl Repacks İndirici")
@@ -521,6 +2647,14 @@ class MainWindow(QMainWindow):
         self.search_button.setStyleSheet(self.get_button_style())
         self.search_button.clicked.connect(self.on_search_clicked)
         self.search_button.setMinimumHeight(40)
+        self.search_input.returnPressed.connect(self.on_search_clicked)
+        self.search_input.textChanged.connect(self.on_search_text_changed)
+        
+        # Yazarken arama için bekleme zamanlayıcısı
+        self.search_debounce = QTimer()
+        self.search_debounce.setSingleShot(True)
+        self.search_debounce.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_debounce.timeout.connect(self.on_search_debounced)
         search_input_layout.addWidget(self.search_input)
         search_input_layout.addWidget(self.search_button)
         search_layout.addLayout(search_input_layout)
@@ -589,6 +2723,56 @@ class MainWindow(QMainWindow):
         
         self.tabs.addTab(url_tab, "🔗 URL")
         
+        # Tanılama sekmesi
+        diagnostics_tab = QWidget()
+        diagnostics_layout = QVBoxLayout()
+        diagnostics_layout.setSpacing(10)
+        diagnostics_tab.setLayout(diagnostics_layout)
+        
+        diagnostics_label = QLabel("İndirme Aşama Süreleri (saniye):")
+        diagnostics_label.setStyleSheet("font-weight: bold; font-size: 12pt; color: #4CAF50; margin-top: 10px;")
+        diagnostics_layout.addWidget(diagnostics_label)
+        
+        self.trace_table = QTableWidget(0, 4)
+        self.trace_table.setHorizontalHeaderLabels(["Aşama", "Adet", "p50", "p95"])
+        self.trace_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.trace_table.verticalHeader().setVisible(False)
+        self.trace_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.trace_table.setStyleSheet("""
+            QTableWidget {
+                background: #2d2d2d;
+                border: 1px solid #444;
+                border-radius: 5px;
+                gridline-color: #333;
+                color: #fff;
+            }
+            QHeaderView::section {
+                background: #1e1e1e;
+                color: #4CAF50;
+                border: none;
+                padding: 5px;
+                font-weight: bold;
+            }
+        """)
+        diagnostics_layout.addWidget(self.trace_table)
+        
+        diagnostics_buttons = QHBoxLayout()
+        diagnostics_buttons.addStretch()
+        refresh_button = QPushButton("🔄 Yenile")
+        refresh_button.setStyleSheet(self.get_button_style())
+        refresh_button.clicked.connect(self.refresh_diagnostics)
+        diagnostics_buttons.addWidget(refresh_button)
+        export_button = QPushButton("💾 Dışa Aktar")
+        export_button.setStyleSheet(self.get_button_style())
+        export_button.clicked.connect(self.on_export_traces_clicked)
+        diagnostics_buttons.addWidget(export_button)
+        diagnostics_layout.addLayout(diagnostics_buttons)
+        
+        self.tabs.addTab(diagnostics_tab, "📊 Tanılama")
+        self.tabs.currentChanged.connect(
+            lambda index: self.refresh_diagnostics() if self.tabs.widget(index) is diagnostics_tab else None
+        )
+        
         # İndirmeler bölümü
         downloads_group = QGroupBox("📥 Aktif İndirmeler")
         downloads_group.setStyleSheet("""
@@ -646,6 +2830,12 @@ class MainWindow(QMainWindow):
         self.status_timer.timeout.connect(self.update_status)
         self.status_timer.start(1000)  # Her saniye güncelle
         
+        # Parça şeritleri tek toplu istekle daha seyrek yenilenir
+        self.piece_map_thread = None
+        self.piece_map_timer = QTimer()
+        self.piece_map_timer.timeout.connect(self.update_piece_maps)
+        self.piece_map_timer.start(self.PIECE_MAP_INTERVAL_MS)
+        
     def apply_dark_theme(self):
         """Karanlık tema uygula"""
         dark_palette = QPalette()
@@ -719,6 +2909,7 @@ class MainWindow(QMainWindow):
         
     def update_status(self):
         """Status'u güncelle"""
+        self.metrics_exporter.tick()
         active_downloads = len([t for t in self.download_threads.values() if t[0].isRunning()])
         if active_downloads > 0:
             self.status_label.setText(f"📥 Aktif indirme: {active_downloads}")
@@ -728,41 +2919,148 @@ class MainWindow(QMainWindow):
             else:
                 self.status_label.setText("⚠ libtorrent bulunamadı")
     
+    def refresh_diagnostics(self):
+        """Aşama sürelerinin p50/p95 özetini tabloya yaz"""
+        summary = self.trace_store.summary()
+        self.trace_table.setRowCount(len(summary))
+        for row, (phase, (count, p50, p95)) in enumerate(summary.items()):
+            self.trace_table.setItem(row, 0, QTableWidgetItem(TraceStore.PHASE_LABELS.get(phase, phase)))
+            self.trace_table.setItem(row, 1, QTableWidgetItem(str(count)))
+            self.trace_table.setItem(row, 2, QTableWidgetItem(f"{p50:.2f}"))
+            self.trace_table.setItem(row, 3, QTableWidgetItem(f"{p95:.2f}"))
+    
+    def on_export_traces_clicked(self):
+        path, _ = QFileDialog.getSaveFileName(self, "İzleri Dışa Aktar", "fgr-traces.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            self.trace_store.export(path)
+            self.status_label.setText(f"✅ İzler kaydedildi: {path}")
+        except OSError as e:
+            self.status_label.setText(f"❌ İzler kaydedilemedi: {str(e)}")
+    
     def on_search_clicked(self):
         query = self.search_input.text().strip()
         if not query:
             self.status_label.setText("⚠ Lütfen bir arama terimi girin")
             return
         
+        self.search_debounce.stop()
+        self.search(query)
+    
+    def on_search_text_changed(self, text):
+        """Yazarken arama: son tuştan SEARCH_DEBOUNCE_MS sonra ara"""
+        if len(text.strip()) < self.SEARCH_MIN_CHARS:
+            self.search_debounce.stop()
+            self.cancel_search()
+            return
+        self.search_debounce.start()
+    
+    def on_search_debounced(self):
+        query = self.search_input.text().strip()
+        if len(query) >= self.SEARCH_MIN_CHARS:
+            self.search(query)
+    
+    def search(self, query):
+        """Önbellekten yanıtla veya yeni bir arama başlat"""
+        key = query.lower()
+        if (self.search_thread is not None and self.search_thread.isRunning()
+                and self.search_thread.search_query.lower() == key):
+            return
+        self.cancel_search()
+        
+        cached = self.cached_search(key)
+        if cached is not None:
+            self.show_search_results(cached, Trace(time.monotonic()))
+            return
+        
+        # Daha kısa bir sorgunun sonuçlarını yerelde süzüp ön izleme olarak göster.
+        # Site yazı içeriğinde de aradığı için yalnızca başlıkla süzülen liste
+        # eksik olabilir; asıl sonuçlar istekten gelir.
+        broader = self.broader_search(key)
+        if broader is not None:
+            terms = key.split()
+            refined = [r for r in broader if all(term in r[0].lower() for term in terms)]
+            self.show_search_results(refined, Trace(time.monotonic()), final=False)
+        else:
+            self.search_results_list.clear()
+        
         self.status_label.setText("🔍 Aranıyor...")
         self.search_button.setEnabled(False)
-        self.search_results_list.clear()
         
-        self.search_thread = SearchThread(query)
-        self.search_thread.results_ready.connect(self.on_search_results)
-        self.search_thread.error.connect(self.on_search_error)
-        self.search_thread.start()
+        thread = SearchThread(query, Trace(time.monotonic()))
+        thread.results_ready.connect(lambda results: self.on_search_results(thread, results))
+        thread.error.connect(lambda error_msg: self.on_search_error(thread, error_msg))
+        # Eski thread'ler bitene kadar referansı tut
+        self.search_threads.add(thread)
+        thread.finished.connect(lambda: self.search_threads.discard(thread))
+        self.search_thread = thread
+        thread.start()
     
-    def on_search_results(self, results):
-        self.search_button.setEnabled(True)
-        if not results:
-            self.status_label.setText("❌ Sonuç bulunamadı")
+    def cancel_search(self):
+        if self.search_thread is not None:
+            self.search_thread.cancel()
+            self.search_thread = None
+            self.search_button.setEnabled(True)
+    
+    def cached_search(self, key):
+        entry = self.search_cache.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.SEARCH_CACHE_TTL:
+            return None
+        self.search_cache.move_to_end(key)
+        return entry[1]
+    
+    def broader_search(self, key):
+        """key'in öneki olan en uzun önbellekteki sorgunun sonuçları"""
+        best = None
+        now = time.monotonic()
+        for cached_key, (cached_at, results) in self.search_cache.items():
+            if (cached_key != key and key.startswith(cached_key) and now - cached_at <= self.SEARCH_CACHE_TTL
+                    and (best is None or len(cached_key) > len(best[0]))):
+                best = (cached_key, results)
+        return best[1] if best is not None else None
+    
+    def cache_search(self, key, results):
+        self.search_cache[key] = (time.monotonic(), results)
+        self.search_cache.move_to_end(key)
+        while len(self.search_cache) > self.SEARCH_CACHE_SIZE:
+            self.search_cache.popitem(last=False)
+    
+    def on_search_results(self, thread, results):
+        self.cache_search(thread.search_query.lower(), results)
+        if thread is not self.search_thread:
+            # Sorgu değişti, eski yanıtı gösterme
             return
+        self.search_thread = None
+        self.search_button.setEnabled(True)
+        self.show_search_results(results, thread.trace)
+    
+    def show_search_results(self, results, trace, final=True):
+        self.search_trace = trace
+        self.search_results_list.clear()
+        if final:
+            if not results:
+                self.status_label.setText("❌ Sonuç bulunamadı")
+                return
+            self.status_label.setText(f"✅ {len(results)} sonuç bulundu")
         
-        self.status_label.setText(f"✅ {len(results)} sonuç bulundu")
         for title, url in results:
             item = QListWidgetItem(title)
             item.setData(Qt.ItemDataRole.UserRole, url)
             self.search_results_list.addItem(item)
     
-    def on_search_error(self, error_msg):
+    def on_search_error(self, thread, error_msg):
+        if thread is not self.search_thread:
+            return
+        self.search_thread = None
         self.search_button.setEnabled(True)
         self.status_label.setText(f"❌ {error_msg}")
     
     def on_result_selected(self, item):
         url = item.data(Qt.ItemDataRole.UserRole)
         if url:
-            self.start_download_from_url(url)
+            trace = self.search_trace.fork() if self.search_trace else None
+            self.start_download_from_url(url, trace)
     
     def on_url_clicked(self):
         url = self.url_input.text().strip()
@@ -776,38 +3074,132 @@ class MainWindow(QMainWindow):
         
         self.start_download_from_url(url)
     
-    def start_download_from_url(self, page_url):
+    def start_download_from_url(self, page_url, trace=None):
         """URL'den magnet bul ve indirmeyi başlat"""
+        trace = trace or Trace(time.monotonic())
         self.status_label.setText("🔗 Magnet link aranıyor...")
         
         # Klasör seç
+        dialog_started = time.monotonic()
         download_dir = QFileDialog.getExistingDirectory(self, "İndirme Klasörü Seçin")
+        trace.span("folder_dialog", dialog_started, time.monotonic())
         if not download_dir:
             self.status_label.setText("❌ İndirme iptal edildi")
             return
         
-        self.magnet_thread = MagnetThread(page_url)
-        self.magnet_thread.magnet_found.connect(lambda magnet: self.start_download(magnet, download_dir))
+        self.magnet_thread = MagnetThread(page_url, trace)
+        self.magnet_thread.links_found.connect(lambda magnet, links: self.on_links_found(magnet, links, download_dir, trace))
         self.magnet_thread.error.connect(self.on_magnet_error)
         self.magnet_thread.start()
     
     def on_magnet_error(self, error_msg):
         self.status_label.setText(f"❌ {error_msg}")
     
-    def start_download(self, magnet_url, download_path):
+    def on_links_found(self, magnet_url, mirrors, download_dir, trace=None):
+        """Torrent veya doğrudan indirme seçimine göre indirmeyi başlat"""
+        if magnet_url and mirrors:
+            box = QMessageBox(self)
+            box.setWindowTitle("İndirme Yöntemi")
+            box.setText(f"Bu sayfada hem magnet link hem de {len(mirrors)} aynada doğrudan indirme bulundu.\n\n"
+                        "Hangi yöntemle indirmek istiyorsunuz?")
+            torrent_btn = box.addButton("🧲 Torrent", QMessageBox.ButtonRole.AcceptRole)
+            direct_btn = box.addButton("⬇ Doğrudan İndirme", QMessageBox.ButtonRole.AcceptRole)
+            box.addButton(QMessageBox.StandardButton.Cancel)
+            box.exec()
+            if box.clickedButton() is torrent_btn:
+                self.start_download(magnet_url, download_dir, trace)
+                return
+            if box.clickedButton() is not direct_btn:
+                self.status_label.setText("❌ İndirme iptal edildi")
+                return
+        elif magnet_url:
+            self.start_download(magnet_url, download_dir, trace)
+            return
+        
+        direct_links = self.choose_mirror(mirrors)
+        if direct_links is None:
+            self.status_label.setText("❌ İndirme iptal edildi")
+            return
+        self.start_direct_download(direct_links, download_dir, trace)
+    
+    def choose_mirror(self, mirrors):
+        """Birden çok ayna varsa kullanıcıya hangisinden indirileceğini sor"""
+        if len(mirrors) == 1:
+            return next(iter(mirrors.values()))
+        hosts = list(mirrors)
+        items = [f"{host} ({len(mirrors[host])} parça)" for host in hosts]
+        item, ok = QInputDialog.getItem(
+            self, "Doğrudan İndirme Aynası", "Parçalar hangi sunucudan indirilsin?", items, 0, False
+        )
+        if not ok:
+            return None
+        return mirrors[hosts[items.index(item)]]
+    
+    def get_engine(self):
+        """İndirme motoruna bağlan, çalışmıyorsa veya çöktüyse yeniden başlat.
+        
+        Motorun açılmasını beklediği için indirme thread'lerinden çağrılır.
+        """
+        with self.engine_lock:
+            if self.engine is not None and self.engine.dead:
+                self.engine.close()
+                self.engine = None
+            if self.engine is None:
+                self.engine = EngineClient.connect(spawn=True)
+            return self.engine
+    
+    def reattach_engine(self):
+        """Arka planda çalışan motordaki indirmeleri listeye geri ekle"""
+        self.engine = EngineClient.connect()
+        if self.engine is None:
+            return
+        
+        try:
+            torrents = self.engine.request("list")
+        except Exception as e:
+            self.status_label.setText(f"❌ Motor hatası: {str(e)}")
+            return
+        
+        for torrent in sorted(torrents, key=lambda t: t["download_id"]):
+            download_id = torrent["download_id"]
+            self.download_counter = max(self.download_counter, download_id + 1)
+            download_thread = DownloadThread(
+                torrent["magnet_url"], torrent["save_path"], download_id, self.engine, attach=True
+            )
+            self.add_download(download_id, download_thread)
+        
+        if torrents:
+            self.status_label.setText(f"🔄 {len(torrents)} indirmeye yeniden bağlanıldı")
+    
+    def start_download(self, magnet_url, download_path, trace=None):
         """Torrent indirmeyi başlat"""
         download_id = self.download_counter
         self.download_counter += 1
         
-        # İndirme thread'ini oluştur
-        download_thread = DownloadThread(magnet_url, download_path, download_id)
+        download_thread = DownloadThread(magnet_url, download_path, download_id, trace=trace, connect=self.get_engine)
+        self.add_download(download_id, download_thread)
+        self.status_label.setText(f"📥 İndirme #{download_id} başlatıldı")
+    
+    def start_direct_download(self, urls, download_path, trace=None):
+        """Doğrudan indirme aynasından parçalı HTTP indirmeyi başlat"""
+        download_id = self.download_counter
+        self.download_counter += 1
+        
+        download_thread = HttpDownloadThread(
+            urls, download_path, download_id, self.metrics, trace, engine=self.engine, config=self.config
+        )
+        self.add_download(download_id, download_thread)
+        self.status_label.setText(f"📥 İndirme #{download_id} başlatıldı ({len(urls)} parça)")
+    
+    def add_download(self, download_id, download_thread):
+        """İndirme thread'ine satır oluşturup başlat"""
         download_thread.progress.connect(lambda p, msg, dl, ul: self.on_download_progress(download_id, p, msg, dl, ul))
         download_thread.finished.connect(lambda path, success: self.on_download_finished(download_id, path, success))
         download_thread.paused.connect(lambda: self.on_download_paused(download_id))
         download_thread.resumed.connect(lambda: self.on_download_resumed(download_id))
         
         # İndirme widget'ını oluştur
-        item_widget = DownloadItemWidget(download_id)
+        item_widget = DownloadItemWidget(download_id, download_thread.history)
         
         # List item oluştur
         list_item = QListWidgetItem()
@@ -818,27 +3210,58 @@ class MainWindow(QMainWindow):
         self.download_threads[download_id] = (download_thread, item_widget, list_item)
         
         download_thread.start()
-        self.status_label.setText(f"📥 İndirme #{download_id} başlatıldı")
     
     def on_download_progress(self, download_id, progress, status_msg, download_speed, upload_speed):
         if download_id in self.download_threads:
             _, item_widget, _ = self.download_threads[download_id]
             item_widget.progress_bar.setValue(progress)
             item_widget.status_label.setText(status_msg)
+            item_widget.rate_graph.refresh()
+    
+    def update_piece_maps(self):
+        """Çalışan indirmelerin parça şeritlerini yenile"""
+        running = {
+            download_id: (thread, item_widget)
+            for download_id, (thread, item_widget, _) in self.download_threads.items()
+            if thread.isRunning()
+        }
+        for thread, item_widget in running.values():
+            if isinstance(thread, HttpDownloadThread):
+                item_widget.piece_strip.set_map(*thread.piece_map())
+        
+        # Torrent haritaları motordan ayrı thread'de alınır; önceki istek bitmediyse atlanır
+        engine = self.engine
+        if (engine is None or engine.dead or not any(isinstance(t, DownloadThread) for t, _ in running.values())
+                or (self.piece_map_thread is not None and self.piece_map_thread.isRunning())):
+            return
+        self.piece_map_thread = PieceMapThread(engine)
+        self.piece_map_thread.maps_ready.connect(self.on_piece_maps)
+        self.piece_map_thread.start()
+    
+    def on_piece_maps(self, maps):
+        for download_id, piece_map in maps.items():
+            entry = self.download_threads.get(download_id)
+            if entry is not None and entry[0].isRunning() and isinstance(entry[0], DownloadThread):
+                entry[1].piece_strip.set_map(*piece_map)
     
     def on_download_finished(self, download_id, download_path, success):
         if download_id in self.download_threads:
-            _, item_widget, _ = self.download_threads[download_id]
+            thread, item_widget, _ = self.download_threads[download_id]
+            kind = "torrent" if isinstance(thread, DownloadThread) else "http"
+            # Yeniden bağlanılan indirmenin izi önceki oturumda kaydedildi ya da eksik
+            if not (kind == "torrent" and thread.attach):
+                self.trace_store.add(download_id, kind, thread.trace, success)
             if success:
                 item_widget.title_label.setText(f"✅ İndirme #{download_id} - Tamamlandı")
                 item_widget.status_label.setText(f"Klasör: {download_path}")
                 item_widget.progress_bar.setValue(100)
+                item_widget.piece_strip.set_map(b"\xff" * PIECE_MAP_BUCKETS, b"\xff" * PIECE_MAP_BUCKETS)
                 item_widget.pause_btn.setEnabled(False)
                 item_widget.resume_btn.setEnabled(False)
                 self.status_label.setText(f"✅ İndirme #{download_id} tamamlandı")
             else:
                 item_widget.title_label.setText(f"❌ İndirme #{download_id} - Başarısız")
-                item_widget.status_label.setText("İndirme durduruldu veya hata oluştu")
+                item_widget.status_label.setText(thread.error_message or "İndirme durduruldu veya hata oluştu")
                 item_widget.pause_btn.setEnabled(False)
                 item_widget.resume_btn.setEnabled(False)
                 self.status_label.setText(f"❌ İndirme #{download_id} başarısız")
@@ -883,34 +3306,99 @@ class MainWindow(QMainWindow):
                 if reply == QMessageBox.StandardButton.Yes:
                     thread.stop()
                     thread.wait(3000)
+            elif self.engine is not None and isinstance(thread, DownloadThread):
+                # Tamamlanan torrent motorda kalmasın
+                try:
+                    self.engine.request("stop", download_id=download_id)
+                except Exception:
+                    pass
             
             # Listeden kaldır
             row = self.downloads_list.row(list_item)
             self.downloads_list.takeItem(row)
             del self.download_threads[download_id]
+            self.metrics.remove_download(download_id)
+    
+    def count_seeding(self):
+        """Motorda seed sınırına ulaşmadan seed edilen torrent sayısı"""
+        engine = self.engine
+        if engine is None or engine.dead:
+            return 0
+        try:
+            torrents = engine.request("list")
+        except Exception:
+            return 0
+        return len([
+            t for t in torrents
+            if t["flags"] & STATUS_FINISHED and not t["flags"] & (STATUS_RETIRED | STATUS_FAILED)
+        ])
     
     def closeEvent(self, event):
-        # Tüm aktif indirmeleri durdur
-        active_count = len([t for t in self.download_threads.values() if t[0].isRunning()])
-        if active_count > 0:
+        running = [t[0] for t in self.download_threads.values() if t[0].isRunning()]
+        # Yalnızca motordaki torrentler arka planda sürebilir; doğrudan indirmeler arayüzle kapanır
+        active_count = len([t for t in running if isinstance(t, DownloadThread)])
+        direct_count = len(running) - active_count
+        seeding_count = self.count_seeding()
+        direct_note = ""
+        if direct_count:
+            direct_note = (f"{direct_count} doğrudan indirme arka planda sürdürülemez ve durdurulur; "
+                           "aynı klasöre yeniden başlatıldığında kaldığı yerden devam eder.")
+        keep_running = False
+        if active_count > 0 or seeding_count > 0:
+            counts = []
+            if active_count:
+                counts.append(f"{active_count} aktif torrent indirmesi")
+            if seeding_count:
+                counts.append(f"seed politikası sınırına ulaşmamış {seeding_count} torrent")
             reply = QMessageBox.question(
                 self,
                 "Aktif İndirmeler Var",
-                f"{active_count} aktif indirme var. Kapatmak istediğinize emin misiniz?",
+                f"{' ve '.join(counts)} var. Arka planda devam etsin mi?\n\n"
+                "Hayır seçilirse tüm indirmeler ve seed'ler durdurulur."
+                + (f"\n\n{direct_note}" if direct_note else ""),
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No | QMessageBox.StandardButton.Cancel
+            )
+            if reply == QMessageBox.StandardButton.Cancel:
+                event.ignore()
+                return
+            keep_running = reply == QMessageBox.StandardButton.Yes
+        elif direct_count:
+            reply = QMessageBox.question(
+                self,
+                "Aktif İndirmeler Var",
+                f"{direct_note}\n\nÇıkmak istediğinize emin misiniz?",
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
             )
-            if reply == QMessageBox.StandardButton.No:
+            if reply != QMessageBox.StandardButton.Yes:
                 event.ignore()
                 return
-            
-            for download_id, (thread, _, _) in self.download_threads.items():
-                if thread.isRunning():
-                    thread.stop()
-                    thread.wait(3000)
+        
+        for thread in running:
+            if keep_running and isinstance(thread, DownloadThread):
+                thread.detach()
+            else:
+                thread.stop()
+            thread.wait(3000)
+        
+        if self.piece_map_thread is not None:
+            self.piece_map_thread.wait(3000)
+        if self.engine is not None:
+            if not keep_running:
+                # Tüm indirmeleri durdur ve motoru kapat
+                try:
+                    self.engine.request("shutdown")
+                except Exception:
+                    pass
+            self.engine.close()
+        self.metrics_exporter.close()
         event.accept()
 
 
 def main():
+    if "--engine" in sys.argv[1:]:
+        run_engine()
+        return
+    
     app = QApplication(sys.argv)
     app.setStyle('Fusion')  # Modern görünüm için
     